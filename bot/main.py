@@ -16,6 +16,8 @@ from loguru import logger
 
 from config import get_settings
 from database import DatabaseRepository
+from services import DotaMonitor, VoiceCommandService, WakeOnLanService
+from services.dota_monitor import create_http_session
 from bot.bot_config import BotConfig
 from handlers import (
     auth_router,
@@ -149,6 +151,12 @@ async def on_startup(bot: Bot):
     await db.init_db()
     logger.info("Database initialized")
     
+    # One keep-alive HTTP session for the app, closed in on_shutdown
+    DotaMonitor.set_session(create_http_session())
+    
+    # Load the Whisper model in the background, off the first voice message
+    VoiceCommandService.warm_up()
+    
     # Setup commands
     await setup_commands(bot)
     
@@ -159,6 +167,10 @@ async def on_shutdown(bot: Bot):
     """Handle bot shutdown."""
     logger.info("Bot shutting down...")
     
+    # Close the shared Dota API session
+    await DotaMonitor.close()
+    WakeOnLanService.close()
+
     # Close database
     db = DatabaseRepository()
     await db.close()
@@ -1,11 +1,13 @@
 """Application settings using Pydantic."""
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import List, Union
+from typing import List, Optional, Union
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from utils.validators import sanitize_mac_address, validate_mac_address
+
 
 # Get the project root directory (where .env file is located)
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -99,6 +101,13 @@ class Settings(BaseSettings):
         default="192.168.1.255",
         alias="PC_BROADCAST_ADDRESS"
     )
+
+    @cached_property
+    def pc_mac_address_normalized(self) -> Optional[str]:
+        """PC_MAC_ADDRESS as XX:XX:XX:XX:XX:XX, or None if it is invalid."""
+        if not validate_mac_address(self.pc_mac_address):
+            return None
+        return sanitize_mac_address(self.pc_mac_address)
     
     # Windows PC Management
     pc_username: str = Field(default="Administrator", alias="PC_USERNAME")
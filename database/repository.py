@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import ClassVar, List, Optional
 
-from sqlalchemy import inspect, select, text
+from sqlalchemy import insert, inspect, select, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -305,6 +305,26 @@ class DatabaseRepository:
             await session.refresh(match)
             return match
 
+    async def add_dota_matches(self, matches: List[dict]) -> int:
+        """Add several Dota 2 matches in a single transaction, skipping known match_ids."""
+        if not matches:
+            return 0
+        async with self.async_session_maker() as session:
+            existing = set(
+                (
+                    await session.execute(
+                        select(DotaMatch.match_id).where(
+                            DotaMatch.match_id.in_([m["match_id"] for m in matches])
+                        )
+                    )
+                ).scalars()
+            )
+            rows = [m for m in matches if m["match_id"] not in existing]
+            if rows:
+                await session.execute(insert(DotaMatch), rows)
+                await session.commit()
+            return len(rows)
+
     async def get_last_dota_match(self) -> Optional[DotaMatch]:
         """Get last Dota 2 match."""
         async with self.async_session_maker() as session:
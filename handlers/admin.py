@@ -13,6 +13,7 @@ from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMar
 from bot.keyboards import get_admin_keyboard
 from database import DatabaseRepository
 from database.models import User
+from services.notifications import NotificationService
 from services.two_factor import TwoFactorService
 
 router = Router()
@@ -187,6 +188,7 @@ async def cmd_approve(message: Message, bot: Bot):
 
     user.is_authorized = True
     await db.update_user(user)
+    NotificationService.invalidate_users_cache()
     await db.add_log_entry(
         action="user_approved",
         user_id=user.id,
@@ -252,6 +254,7 @@ async def cmd_unban(message: Message, bot: Bot):
     user.failed_login_attempts = 0
     user.locked_until = None
     await db.update_user(user)
+    NotificationService.invalidate_users_cache()
     await db.add_log_entry(
         action="user_unbanned",
         user_id=user.id,
@@ -412,6 +415,7 @@ async def callback_admin_confirm(callback: CallbackQuery, bot: Bot):
             return
         user.is_authorized = False
         await db.update_user(user)
+        NotificationService.invalidate_users_cache()
         await db.add_log_entry(
             action="user_rejected",
             user_id=user.id,
@@ -427,6 +431,7 @@ async def callback_admin_confirm(callback: CallbackQuery, bot: Bot):
         user.is_authorized = False
         user.is_admin = False
         await db.update_user(user)
+        NotificationService.invalidate_users_cache()
         await db.add_log_entry(
             action="user_banned",
             user_id=user.id,
@@ -607,6 +607,7 @@ async def cmd_login(message: Message):
         await login_security.record_successful_login(message.from_user.id)
         user.is_authorized = True
         await db.update_user(user)
+        NotificationService.invalidate_users_cache()
         await db.add_log_entry(
             action="login_success",
             user_id=user.id,
@@ -765,6 +766,7 @@ async def cmd_2fa_verify_short(message: Message):
     if await two_factor_service.verify_code(message.from_user.id, code):
         user.is_authorized = True
         await db.update_user(user)
+        NotificationService.invalidate_users_cache()
         await login_security.record_successful_login(message.from_user.id)
         await db.add_log_entry(
             action="2fa_login_success",
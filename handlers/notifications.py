@@ -6,6 +6,7 @@ from aiogram.types import Message, CallbackQuery
 from bot.filters import IsAuthorized
 from bot.keyboards import get_main_keyboard, get_admin_keyboard
 from database import DatabaseRepository
+from services import NotificationService
 from utils import get_logger
 
 router = Router()
@@ -30,6 +31,7 @@ async def cmd_notify(message: Message, bot: Bot):
     # Toggle notifications
     user.notifications_enabled = not user.notifications_enabled
     await db.update_user(user)
+    NotificationService.invalidate_users_cache()
     
     status = "enabled" if user.notifications_enabled else "disabled"
     
@@ -59,6 +61,7 @@ async def callback_toggle_notifications(callback: CallbackQuery, bot: Bot):
     # Toggle notifications
     user.notifications_enabled = not user.notifications_enabled
     await db.update_user(user)
+    NotificationService.invalidate_users_cache()
     
     status = "enabled" if user.notifications_enabled else "disabled"
     
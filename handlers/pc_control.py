@@ -445,7 +445,7 @@ async def callback_confirm(callback: CallbackQuery, bot: Bot) -> None:
         await callback.answer("Нет доступа.", show_alert=True)
         return
     pc = PCManager()
-    notif = NotificationService()
+    notif = NotificationService(bot)
 
     if action == "reboot":
         ok = await pc.reboot(delay_minutes=1)
@@ -45,8 +45,7 @@ async def handle_voice_message(message: Message, bot: Bot) -> None:
     if not _voice_service.available:
         await message.answer(
             "Голосовые команды недоступны.\n"
-            "Установите Whisper: <code>pip install openai-whisper</code> "
-            "и ffmpeg: <code>pacman -S ffmpeg</code>",
+            "Установите Whisper: <code>pip install faster-whisper</code>",
             parse_mode="HTML",
         )
         return
@@ -14,12 +14,38 @@ Player account ID (32-bit) is read from DOTA2_ACCOUNT_ID.
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import contextlib
+import functools
+import math
+import random
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Any, Callable, ClassVar, Dict, List, Mapping, Optional, Tuple, Union
 
 import aiohttp
+from asyncio_throttle import Throttler
 from loguru import logger
 
+try:
+    import orjson as _json  # ~3x faster than stdlib on large OpenDota payloads
+except ImportError:  # pragma: no cover - optional speedup
+    import json as _json  # type: ignore[no-redef]
+
+try:
+    import simdjson as _simdjson
+
+    # One parser is reused for every lazy parse; a document must be released
+    # before the next parse (see _decode).
+    _SIMD_PARSER: Optional[Any] = _simdjson.Parser()
+    _ARRAY_TYPES: Tuple[type, ...] = (list, _simdjson.Array)
+    _OBJECT_TYPES: Tuple[type, ...] = (dict, _simdjson.Object)
+except ImportError:  # pragma: no cover - optional speedup
+    _SIMD_PARSER = None
+    _ARRAY_TYPES = (list,)
+    _OBJECT_TYPES = (dict,)
+
 from config import get_settings
 from database import DatabaseRepository
 
@@ -33,8 +59,42 @@ STEAM_API_BASE = "https://api.steampowered.com"
 OPENDOTA_BASE = "https://api.opendota.com/api"
 STEAM_ID_OFFSET = 76561197960265728
 
+# Response cache lifetimes, seconds (0 = no caching, only in-flight sharing)
+HEROES_TTL = 24 * 3600
+MATCH_TTL = math.inf  # finished matches are immutable
+LIVE_TTL = 5
+SUMMARY_TTL = 60
+_RESPONSE_CACHE_MAX = 2048  # LRU bound (finished matches never expire)
+
+# Cache lifetime: seconds, or a function of the response returning seconds
+TTL = Union[float, Callable[[Any], float]]
+
+# Max concurrent OpenDota requests (keeps bursts under its rate limit)
+OPENDOTA_MAX_CONCURRENCY = 8
+
+# Proactive request budgets: (requests, period in seconds)
+STEAM_RATE_LIMIT = (1, 1.0)        # ~100k calls/day
+OPENDOTA_RATE_LIMIT = (60, 60.0)   # free tier: 60 calls/min
+
+# Retries for 429/5xx/timeouts: capped exponential backoff with jitter
+MAX_RETRIES = 2
+BACKOFF_FACTOR = 0.5
+BACKOFF_CAP = 30.0
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Default timeout of the shared session
+_HTTP_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+_UTC = timezone.utc
+
+# Endpoints probed by DotaMonitor.test_api_connection (steamid param name)
+STEAM_TEST_ENDPOINTS = (
+    ("ISteamUser/GetPlayerSummaries/v0002/", "steamids"),
+    ("IPlayerService/GetRecentlyPlayedGames/v0001/", "steamid"),
+)
+
 # Game mode names (most common)
-GAME_MODES: Dict[int, str] = {
+GAME_MODES: Mapping[int, str] = MappingProxyType({
     0: "Unknown",
     1: "All Pick",
     2: "Captain's Mode",
@@ -60,10 +120,18 @@ GAME_MODES: Dict[int, str] = {
     22: "Ranked",
     23: "Turbo",
     24: "Mutation",
-}
+})
+
+# Hero lookup before /heroes has been loaded
+_NO_HEROES: Mapping[int, str] = MappingProxyType({})
+
+# Dense index → name table for the per-row lookup in game_mode_name
+_GAME_MODE_NAMES: Tuple[str, ...] = tuple(
+    GAME_MODES.get(i, "") for i in range(max(GAME_MODES) + 1)
+)
 
 # Lobby types
-LOBBY_TYPES: Dict[int, str] = {
+LOBBY_TYPES: Mapping[int, str] = MappingProxyType({
     -1: "Invalid",
     0: "Public Matchmaking",
     1: "Practice",
@@ -74,10 +142,10 @@ LOBBY_TYPES: Dict[int, str] = {
     6: "Solo Queue",
     7: "Ranked",
     8: "1v1 Solo Mid",
-}
+})
 
 # Permanent buff names (item/ability IDs from OpenDota)
-BUFF_NAMES: Dict[int, str] = {
+BUFF_NAMES: Mapping[int, str] = MappingProxyType({
     # Aghanim's upgrades tracked as permanent buffs
     108:  "Aghanim's Scepter",
     609:  "Aghanim's Shard",
@@ -90,24 +158,82 @@ BUFF_NAMES: Dict[int, str] = {
     # Ability permanent buffs (ability_id references)
     5004: "Rupture (Bloodseeker)",
     5317: "Glyph of Fortification",
-}
+})
+
+
+class _RetryableStatus(Exception):
+    """Transient HTTP status worth retrying (429/5xx)."""
+
+    def __init__(self, status: int, retry_after: Optional[float] = None) -> None:
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class _BackedOff(Exception):
+    """The API asked for a pause longer than BACKOFF_CAP; fail fast until it ends."""
+
+    def __init__(self, remaining: float) -> None:
+        super().__init__(f"backed off for {remaining:.0f}s")
+        self.remaining = remaining
 
 
 class DotaMonitor:
-    """Dota 2 player and match monitoring service (Steam + OpenDota)."""
+    """
+    Dota 2 player and match monitoring service (Steam + OpenDota).
+
+    Handlers create a new monitor per command, so the keep-alive HTTP
+    session, response cache and in-flight requests live at class level.
+    The bot installs an app-scoped session at startup (``set_session``) and
+    closes it at shutdown (``close``); a session may also be passed per
+    instance.  Without either, one is created lazily.
+    """
+
+    _response_cache: ClassVar[OrderedDict[Tuple[Any, ...], Tuple[float, Any]]] = OrderedDict()
+    _inflight: ClassVar[Dict[Tuple[Any, ...], asyncio.Task]] = {}
+    _session: ClassVar[Optional[aiohttp.ClientSession]] = None
+    _opendota_slots: ClassVar[asyncio.Semaphore] = asyncio.Semaphore(OPENDOTA_MAX_CONCURRENCY)
+    _throttlers: ClassVar[Dict[str, Throttler]] = {
+        "steam": Throttler(*STEAM_RATE_LIMIT, retry_interval=0.05),
+        "opendota": Throttler(*OPENDOTA_RATE_LIMIT, retry_interval=0.1),
+    }
+    # api → monotonic time until which the server asked us to back off
+    _blocked_until: ClassVar[Dict[str, float]] = {}
+    # request key → (ETag, Last-Modified, decoded body) for conditional GETs
+    _validators: ClassVar[OrderedDict[Tuple[Any, ...], Tuple[Optional[str], Optional[str], Any]]] = OrderedDict()
 
     def __init__(
         self,
         steam_api_key: Optional[str] = None,
         account_id: Optional[str] = None,
+        session: Optional[aiohttp.ClientSession] = None,
     ) -> None:
         self.steam_api_key = steam_api_key or settings.dota2_steam_api_key
         # account_id can be either 64-bit Steam ID or 32-bit Dota ID
         raw_id = account_id or settings.dota2_account_id or "0"
-        self.account_id_64 = int(raw_id)
-        self.account_id_32 = self._to_32bit(self.account_id_64)
+        # Both forms are resolved once; requests only read them
+        self.account_id_32 = self._to_32bit(int(raw_id))
+        self.account_id_64 = self._to_64bit(self.account_id_32)
+        # Per-account request strings, built once instead of on every poll
+        self._steam_id_64_str = str(self.account_id_64)
+        self._recent_matches_url = f"players/{self.account_id_32}/recentMatches"
+        self._matches_url = f"players/{self.account_id_32}/matches"
+        self._injected_session = session  # owned by the caller, never closed here
         self.db = DatabaseRepository()
-        self._hero_cache: Dict[int, str] = {}  # hero_id → hero name
+        # hero_id → hero name; the shared read-only map from OpenDota /heroes
+        self._hero_cache: Mapping[int, str] = _NO_HEROES
+
+    @classmethod
+    def set_session(cls, session: aiohttp.ClientSession) -> None:
+        """Install the app-scoped HTTP session shared by all monitors."""
+        cls._session = session
+
+    @classmethod
+    async def close(cls) -> None:
+        """Close the shared HTTP session, if one was opened (app shutdown)."""
+        if cls._session is not None and not cls._session.closed:
+            await cls._session.close()
+        cls._session = None
 
     # ------------------------------------------------------------------
     # ID helpers
@@ -134,7 +260,10 @@ class DotaMonitor:
     # ------------------------------------------------------------------
 
     async def _steam_get(
-        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        ttl: TTL = 0,
     ) -> Optional[Dict[str, Any]]:
         """GET request to Steam Web API."""
         if not self.steam_api_key:
@@ -143,36 +272,239 @@ class DotaMonitor:
         p = dict(params or {})
         p["key"] = self.steam_api_key
         url = f"{STEAM_API_BASE}/{endpoint}"
-        return await _http_get(url, p)
+        return await self._http_get(url, p, ttl=ttl)
 
     async def _opendota_get(
-        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        extract: Optional[Callable[[Any], Any]] = None,
+        ttl: TTL = 0,
     ) -> Any:
         """GET request to OpenDota API (no key required for public data)."""
         url = f"{OPENDOTA_BASE}/{endpoint}"
-        return await _http_get(url, params)
+        return await self._http_get(url, params, extract, ttl)
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Return the injected or app-scoped session (created lazily as a fallback)."""
+        if self._injected_session is not None and not self._injected_session.closed:
+            return self._injected_session
+        cls = type(self)
+        if cls._session is None or cls._session.closed:
+            cls._session = create_http_session()
+        return cls._session
+
+    async def _http_get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        extract: Optional[Callable[[Any], Any]] = None,
+        ttl: TTL = 0,
+    ) -> Any:
+        """
+        GET with response caching and in-flight request sharing.
+
+        A fresh cached value is returned for ``ttl`` seconds (``ttl`` may be
+        a callable deciding per response); concurrent calls with the same
+        URL/params/extractor await a single HTTP request.  Failed requests
+        (None) are never cached.
+        """
+        key = (
+            url,
+            tuple(sorted((params or {}).items())),
+            _extractor_key(extract),
+        )
+        cached = self._response_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._response_cache.move_to_end(key)
+            return cached[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(url, params, extract, key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._store_response(key, t, ttl))
+        # shield: a cancelled caller must not cancel the request for the others
+        return await asyncio.shield(task)
+
+    @classmethod
+    def _store_response(cls, key: Tuple[Any, ...], task: asyncio.Task, ttl: TTL) -> None:
+        """Done-callback of a shared request: drop it from in-flight, cache result."""
+        cls._inflight.pop(key, None)
+        if not ttl or task.cancelled() or task.exception() is not None:
+            return
+        data = task.result()
+        if data is None:
+            return
+        if callable(ttl):
+            ttl = ttl(data)
+            if not ttl:
+                return
+        cache = cls._response_cache
+        cache[key] = (time.monotonic() + ttl, data)
+        cache.move_to_end(key)
+        while len(cache) > _RESPONSE_CACHE_MAX:
+            cache.popitem(last=False)
+
+    async def _fetch(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        extract: Optional[Callable[[Any], Any]] = None,
+        key: Optional[Tuple[Any, ...]] = None,
+    ) -> Any:
+        """
+        Perform an async GET request, return parsed JSON (or extract(JSON)) or None.
+
+        Retries _do_request on 429/5xx, timeouts and connection errors with
+        capped, jittered backoff.  A Retry-After longer than BACKOFF_CAP is
+        not waited out: the call returns None at once, as do later calls to
+        the same API until the pause ends.  With ``key``, a previous
+        ETag/Last-Modified is revalidated; a 304 returns the body decoded
+        last time.
+        """
+        api = "opendota" if url.startswith(OPENDOTA_BASE) else "steam"
+        for attempt in range(MAX_RETRIES + 1):
+            retry_after: Optional[float] = None
+            try:
+                return await self._do_request(api, url, params, extract, key)
+            except _RetryableStatus as exc:
+                failure = f"HTTP {exc.status}"
+                retry_after = exc.retry_after
+                if retry_after and retry_after > BACKOFF_CAP:
+                    logger.warning(
+                        f"{failure} for {url}, server asked to wait {retry_after:.0f}s; giving up"
+                    )
+                    return None
+            except _BackedOff as exc:
+                logger.warning(f"{api} API {exc}, skipping {url}")
+                return None
+            except asyncio.TimeoutError:
+                failure = "Timeout"
+            except aiohttp.ClientConnectionError as exc:
+                failure = f"Connection error ({exc})"
+            except Exception as exc:
+                logger.error(f"HTTP error for {url}: {exc}")
+                return None
+
+            if attempt == MAX_RETRIES:
+                break
+            delay = retry_after if retry_after else _backoff_delay(attempt)
+            logger.warning(
+                f"{failure} for {url}, retry {attempt + 1}/{MAX_RETRIES} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+        logger.error(f"{failure} for {url}, giving up")
+        return None
+
+    async def _do_request(
+        self,
+        api: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        extract: Optional[Callable[[Any], Any]],
+        key: Optional[Tuple[Any, ...]],
+    ) -> Any:
+        """
+        One rate-limited GET attempt (no retries).
+
+        Raises _RetryableStatus, asyncio.TimeoutError or
+        aiohttp.ClientConnectionError for failures worth retrying, and
+        _BackedOff while a long server-requested pause is in effect.
+        """
+        slots = self._opendota_slots if api == "opendota" else contextlib.nullcontext()
+        session = await self._ensure_session()
+        async with slots:
+            await self._wait_for_budget(api)
+            async with session.get(
+                url, params=params, headers=self._conditional_headers(key)
+            ) as resp:
+                return await self._read_response(api, url, resp, extract, key)
+
+    @classmethod
+    async def _wait_for_budget(cls, api: str) -> None:
+        """Honour a server-requested pause, then take a token from the API's bucket."""
+        delay = cls._blocked_until.get(api, 0.0) - time.monotonic()
+        if delay > BACKOFF_CAP:
+            raise _BackedOff(delay)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await cls._throttlers[api].acquire()
+
+    @classmethod
+    def _conditional_headers(cls, key: Optional[Tuple[Any, ...]]) -> Optional[Dict[str, str]]:
+        """If-None-Match / If-Modified-Since for a previously seen response."""
+        stored = cls._validators.get(key) if key is not None else None
+        if stored is None:
+            return None
+        etag, last_modified, _ = stored
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    @classmethod
+    async def _read_response(
+        cls,
+        api: str,
+        url: str,
+        resp: aiohttp.ClientResponse,
+        extract: Optional[Callable[[Any], Any]],
+        key: Optional[Tuple[Any, ...]] = None,
+    ) -> Any:
+        """Decode a 200 response (or reuse it on 304); raise _RetryableStatus for 429/5xx."""
+        if resp.status == 304 and key in cls._validators:
+            cls._validators.move_to_end(key)
+            return cls._validators[key][2]
+        if resp.status == 200:
+            raw = await resp.read()
+            try:
+                data = _decode(raw, extract)
+            except ValueError:
+                logger.warning(f"Invalid JSON in response from {url}")
+                return None
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            if key is not None and data is not None and (etag or last_modified):
+                cls._validators[key] = (etag, last_modified, data)
+                cls._validators.move_to_end(key)
+                while len(cls._validators) > _RESPONSE_CACHE_MAX:
+                    cls._validators.popitem(last=False)
+            return data
+        if resp.status in _RETRY_STATUSES:
+            retry_after = _parse_retry_after(resp.headers.get("Retry-After"))
+            if retry_after:
+                cls._blocked_until[api] = time.monotonic() + retry_after
+            raise _RetryableStatus(resp.status, retry_after)
+        logger.warning(f"HTTP {resp.status} for {url}")
+        return None
 
     # ------------------------------------------------------------------
     # Hero name resolution (cached from OpenDota)
     # ------------------------------------------------------------------
 
     async def _ensure_hero_cache(self) -> None:
-        """Populate hero name cache from OpenDota /heroes if empty."""
+        """Point the hero lookup at the shared /heroes map (fetched at most daily)."""
         if self._hero_cache:
             return
-        data = await self._opendota_get("heroes")
-        if isinstance(data, list):
-            for hero in data:
-                self._hero_cache[hero["id"]] = hero.get("localized_name", f"Hero {hero['id']}")
+        heroes = await self._opendota_get(
+            "heroes", extract=_extract_hero_names, ttl=HEROES_TTL
+        )
+        if heroes:
+            # Same cached object for every monitor: no per-instance copy
+            self._hero_cache = heroes
             logger.info(f"Hero cache loaded: {len(self._hero_cache)} heroes.")
 
     def get_hero_name(self, hero_id: int) -> str:
         """Resolve hero name by ID (uses cache)."""
-        return self._hero_cache.get(hero_id, f"Hero #{hero_id}")
+        return self._hero_cache.get(hero_id) or unknown_hero_label(hero_id)
 
     def get_game_mode(self, mode_id: int) -> str:
         """Resolve game mode name by ID."""
-        return GAME_MODES.get(mode_id, f"Mode #{mode_id}")
+        return game_mode_name(mode_id)
 
     # ------------------------------------------------------------------
     # Steam: player online / in-game status
@@ -180,20 +512,26 @@ class DotaMonitor:
 
     async def get_player_summary(self) -> Optional[Dict[str, Any]]:
         """Return Steam player summary for the configured account."""
-        steam_id_64 = self._to_64bit(self.account_id_32)
         data = await self._steam_get(
             "ISteamUser/GetPlayerSummaries/v0002/",
-            {"steamids": str(steam_id_64)},
+            {"steamids": self._steam_id_64_str},
+            ttl=SUMMARY_TTL,
         )
         players = (data or {}).get("response", {}).get("players", [])
         return players[0] if players else None
 
-    async def get_player_status(self) -> Dict[str, Any]:
+    async def get_player_status(
+        self,
+        *,
+        need_summary: bool = True,
+        need_last_match: bool = True,
+    ) -> Dict[str, Any]:
         """
         High-level player status: online, in Dota 2, last match summary.
-        """
-        await self._ensure_hero_cache()
 
+        need_summary=False skips the Steam request (online/in_game stay False);
+        need_last_match=False skips the OpenDota requests (last_match is None).
+        """
         status: Dict[str, Any] = {
             "online": False,
             "in_game": False,
@@ -203,8 +541,19 @@ class DotaMonitor:
             "last_match": None,
         }
 
-        summary = await self.get_player_summary()
-        if summary:
+        # Hero list, Steam summary and last match are independent requests;
+        # one failing must not discard the others
+        heroes, summary, recent = await asyncio.gather(
+            self._ensure_hero_cache() if need_last_match else _none(),
+            self.get_player_summary() if need_summary else _none(),
+            self._opendota_get(self._recent_matches_url) if need_last_match else _none(),
+            return_exceptions=True,
+        )
+        for result in (heroes, summary, recent):
+            if isinstance(result, Exception):
+                logger.error(f"Player status lookup failed: {result}")
+
+        if isinstance(summary, dict):
             status["player_name"] = summary.get("personaname")
             persona_state = summary.get("personastate", 0)
             status["online"] = persona_state > 0
@@ -214,12 +563,11 @@ class DotaMonitor:
                 status["game_extra"] = summary.get("gameextrainfo", "Dota 2")
 
         # Last played match from OpenDota
-        recent = await self._opendota_get(
-            f"players/{self.account_id_32}/recentMatches"
-        )
         if isinstance(recent, list) and recent:
             m = recent[0]
             hero_id = m.get("hero_id", 0)
+            # High bit of player_slot marks Dire
+            won = m.get("radiant_win") == ((m.get("player_slot", 0) & 128) == 0)
             status["last_match"] = {
                 "match_id": m.get("match_id"),
                 "hero_id": hero_id,
@@ -228,10 +576,8 @@ class DotaMonitor:
                 "deaths": m.get("deaths", 0),
                 "assists": m.get("assists", 0),
                 "duration_min": round(m.get("duration", 0) / 60, 1),
-                "won": m.get("radiant_win") == (m.get("player_slot", 0) < 128),
-                "started_at": datetime.utcfromtimestamp(
-                    m["start_time"]
-                ).strftime("%Y-%m-%d %H:%M UTC")
+                "won": won,
+                "started_at": _format_utc(m["start_time"])
                 if m.get("start_time")
                 else None,
             }
@@ -244,30 +590,37 @@ class DotaMonitor:
 
     async def get_match_history(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Return recent match summaries from OpenDota."""
-        await self._ensure_hero_cache()
-        data = await self._opendota_get(
-            f"players/{self.account_id_32}/matches",
-            {"limit": limit},
+        _, data = await asyncio.gather(
+            self._ensure_hero_cache(),
+            self._opendota_get(
+                self._matches_url,
+                {"limit": limit},
+            ),
         )
         if not isinstance(data, list):
             return []
+        return self._format_history(data)
 
+    def _format_history(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Format raw OpenDota player match rows (hero cache must be loaded)."""
+        hero_get = self._hero_cache.get
+        game_mode = game_mode_name
         result = []
         for m in data:
             hero_id = int(m.get("hero_id") or 0)
+            # High bit of player_slot marks Dire
+            won = m.get("radiant_win") == ((m.get("player_slot", 0) & 128) == 0)
             result.append({
                 "match_id": m.get("match_id"),
                 "hero_id": hero_id,
-                "hero_name": self.get_hero_name(hero_id),
+                "hero_name": hero_get(hero_id) or unknown_hero_label(hero_id),
                 "kills": m.get("kills", 0),
                 "deaths": m.get("deaths", 0),
                 "assists": m.get("assists", 0),
                 "duration_min": round(m.get("duration", 0) / 60, 1),
-                "game_mode": self.get_game_mode(m.get("game_mode", 0)),
-                "won": m.get("radiant_win") == (m.get("player_slot", 0) < 128),
-                "started_at": datetime.utcfromtimestamp(
-                    m["start_time"]
-                ).strftime("%Y-%m-%d %H:%M UTC")
+                "game_mode": game_mode(m.get("game_mode", 0)),
+                "won": won,
+                "started_at": _format_utc(m["start_time"])
                 if m.get("start_time")
                 else None,
             })
@@ -279,7 +632,7 @@ class DotaMonitor:
 
     async def get_match_details(self, match_id: int) -> Optional[Dict[str, Any]]:
         """Return full match details from OpenDota."""
-        return await self._opendota_get(f"matches/{match_id}")
+        return await self._opendota_get(f"matches/{match_id}", ttl=_match_ttl)
 
     async def get_match_buffs(self, match_id: int) -> Dict[str, Any]:
         """
@@ -301,46 +654,56 @@ class DotaMonitor:
             ]
         }
         """
-        await self._ensure_hero_cache()
-        details = await self.get_match_details(match_id)
-        if not details or "players" not in details:
+        _, result = await asyncio.gather(
+            self._ensure_hero_cache(),
+            self._opendota_get(
+                f"matches/{match_id}",
+                extract=self._extract_match_buffs,
+                ttl=_match_ttl,
+            ),
+        )
+        if not result:
             return {"match_id": match_id, "players": []}
+        # Hero names are resolved here: the cache may still have been
+        # loading while the match document was parsed.  The result is shared
+        # through the response cache, so build new dicts instead of mutating.
+        hero_get = self._hero_cache.get
+        players = [
+            {
+                **player,
+                "hero_name": hero_get(player["hero_id"]) or unknown_hero_label(player["hero_id"]),
+            }
+            for player in result["players"]
+        ]
+        return {**result, "match_id": match_id, "players": players}
 
-        players_out = []
-        for p in details["players"]:
-            slot = p.get("player_slot", 0)
-            team = "Radiant" if slot < 128 else "Dire"
-            hero_id = p.get("hero_id", 0)
+    def _extract_match_buffs(self, details: Any) -> Optional[Dict[str, Any]]:
+        """Build the get_match_buffs payload from a (lazy) match document."""
+        if not isinstance(details, _OBJECT_TYPES) or "players" not in details:
+            return None
 
-            # permanent_buffs is a list of {permanent_buff, stack_count}
-            raw_buffs = p.get("permanent_buffs") or []
-            buffs = []
-            for b in raw_buffs:
-                buff_id = b.get("permanent_buff", 0)
-                count = b.get("stack_count", 1)
-                name = BUFF_NAMES.get(buff_id, f"Buff #{buff_id}")
-                buffs.append({"name": name, "stack_count": count})
+        # Radiant first, then Dire — partitioned while iterating, no sort needed
+        radiant: List[Dict[str, Any]] = []
+        dire: List[Dict[str, Any]] = []
+        for p in details["players"]:
+            is_radiant = (p.get("player_slot", 0) & 128) == 0
 
-            players_out.append({
+            (radiant if is_radiant else dire).append({
                 "account_id": p.get("account_id"),
-                "hero_name": self.get_hero_name(hero_id),
-                "team": team,
-                "buffs": buffs,
+                "hero_id": p.get("hero_id", 0),
+                "team": "Radiant" if is_radiant else "Dire",
+                "buffs": _buff_list(p.get("permanent_buffs")),
                 "kda": f"{p.get('kills', 0)}/{p.get('deaths', 0)}/{p.get('assists', 0)}",
                 "net_worth": p.get("total_gold", 0),
                 "level": p.get("level", 0),
                 "damage_dealt": p.get("hero_damage", 0),
             })
 
-        # Sort: Radiant first, then Dire
-        players_out.sort(key=lambda x: (0 if x["team"] == "Radiant" else 1))
-
         return {
-            "match_id": match_id,
             "duration_min": round(details.get("duration", 0) / 60, 1),
-            "game_mode": self.get_game_mode(details.get("game_mode", 0)),
+            "game_mode": game_mode_name(details.get("game_mode", 0)),
             "radiant_win": details.get("radiant_win"),
-            "players": players_out,
+            "players": radiant + dire,
         }
 
     # ------------------------------------------------------------------
@@ -356,42 +719,35 @@ class DotaMonitor:
 
         Returns None if the player is not in a live match.
         """
-        await self._ensure_hero_cache()
-        live_data = await self._opendota_get("live")
-        if not isinstance(live_data, list):
+        # The scan stops at our player's match; other matches stay unparsed
+        _, match = await asyncio.gather(
+            self._ensure_hero_cache(),
+            self._opendota_get(
+                "live",
+                extract=functools.partial(_find_live_match, self.account_id_32),
+                ttl=LIVE_TTL,
+            ),
+        )
+        if not match:
             return None
+        return self._format_live_match(match)
 
-        for match in live_data:
-            players = match.get("players") or []
-            for p in players:
-                # OpenDota /live uses account_id (32-bit)
-                if int(p.get("account_id", -1)) == self.account_id_32:
-                    return await self._format_live_match(match)
-
-        return None
-
-    async def _format_live_match(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+    def _format_live_match(self, raw: Dict[str, Any]) -> Dict[str, Any]:
         """Format a raw OpenDota /live match entry."""
-        players_out = []
+        hero_get = self._hero_cache.get
+        # Radiant first, then Dire — partitioned while iterating, no sort needed
+        radiant: List[Dict[str, Any]] = []
+        dire: List[Dict[str, Any]] = []
         for p in raw.get("players", []):
             hero_id = p.get("hero_id", 0)
-            slot = p.get("team", 0)  # 0=Radiant, 1=Dire in /live
-            team = "Radiant" if slot == 0 else "Dire"
-
-            # Permanent buffs are available in live data too
-            raw_buffs = p.get("permanent_buffs") or []
-            buffs = []
-            for b in raw_buffs:
-                buff_id = b.get("permanent_buff", 0)
-                count = b.get("stack_count", 1)
-                name = BUFF_NAMES.get(buff_id, f"Buff #{buff_id}")
-                buffs.append({"name": name, "stack_count": count})
-
-            players_out.append({
+            is_radiant = p.get("team", 0) == 0  # 0=Radiant, 1=Dire in /live
+
+            (radiant if is_radiant else dire).append({
                 "account_id": p.get("account_id"),
-                "hero_name": self.get_hero_name(hero_id),
-                "team": team,
-                "buffs": buffs,
+                "hero_name": hero_get(hero_id) or unknown_hero_label(hero_id),
+                "team": "Radiant" if is_radiant else "Dire",
+                # Permanent buffs are available in live data too
+                "buffs": _buff_list(p.get("permanent_buffs")),
                 "net_worth": p.get("net_worth", 0),
                 "level": p.get("level", 0),
                 "kills": p.get("kills", 0),
@@ -399,8 +755,6 @@ class DotaMonitor:
                 "assists": p.get("assists", 0),
             })
 
-        players_out.sort(key=lambda x: (0 if x["team"] == "Radiant" else 1))
-
         elapsed_sec = raw.get("game_time", 0)
         elapsed_min = elapsed_sec // 60
         elapsed_s = elapsed_sec % 60
@@ -408,10 +762,10 @@ class DotaMonitor:
         return {
             "match_id": raw.get("match_id"),
             "game_time": f"{elapsed_min}:{elapsed_s:02d}",
-            "game_mode": self.get_game_mode(raw.get("game_mode", 0)),
+            "game_mode": game_mode_name(raw.get("game_mode", 0)),
             "radiant_score": raw.get("radiant_score", 0),
             "dire_score": raw.get("dire_score", 0),
-            "players": players_out,
+            "players": radiant + dire,
         }
 
     # ------------------------------------------------------------------
@@ -420,33 +774,245 @@ class DotaMonitor:
 
     async def check_new_matches(self) -> List[Dict[str, Any]]:
         """Return matches played since the last DB record."""
-        last = await self.db.get_last_dota_match()
-        matches = await self.get_match_history(5)
+        # The DB lookup and the history request are independent
+        last, data = await asyncio.gather(
+            self.db.get_last_dota_match(),
+            self._opendota_get(self._matches_url, {"limit": 5}),
+        )
+        if not isinstance(data, list) or not data:
+            return []
+        # Common idle poll: newest match is already stored
+        if last and data[0].get("match_id") == last.match_id:
+            return []
+
+        await self._ensure_hero_cache()
         new: List[Dict[str, Any]] = []
-        for m in matches:
-            if last and last.match_id == m["match_id"]:
+        for m in data:
+            if last and last.match_id == m.get("match_id"):
                 break
             new.append(m)
-            await self.db.add_dota_match(m)
-        return new
+        if new:
+            # One transaction for the whole batch
+            await self.db.add_dota_matches([self._match_record(m) for m in new])
+        return self._format_history(new)
+
+    def _match_record(self, m: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a raw OpenDota player match row to DotaMatch columns."""
+        start_time = m.get("start_time")
+        return {
+            "match_id": m.get("match_id"),
+            "steam_id": self._steam_id_64_str,
+            "hero_id": m.get("hero_id"),
+            "kills": m.get("kills"),
+            "deaths": m.get("deaths"),
+            "assists": m.get("assists"),
+            "duration": m.get("duration"),
+            "game_mode": m.get("game_mode"),
+            # Naive UTC, like the other DateTime columns
+            "started_at": datetime.fromtimestamp(start_time, _UTC).replace(tzinfo=None)
+            if start_time
+            else None,
+        }
+
+    # ------------------------------------------------------------------
+    # Diagnostics (used by test_steam_api.py)
+    # ------------------------------------------------------------------
+
+    async def test_api_connection(self) -> Dict[str, Any]:
+        """
+        Probe Steam Web API endpoints with the configured key.
+
+        Returns status ("success" | "failed"), api_key_valid, steam_id,
+        masked steam_api_key, error and per-endpoint results.
+        """
+        steam_id_64 = self._steam_id_64_str
+        key = self.steam_api_key or ""
+        result: Dict[str, Any] = {
+            "status": "failed",
+            "api_key_valid": False,
+            "steam_id": steam_id_64,
+            "steam_api_key": f"{key[:8]}..." if key else "NOT SET",
+            "error": None,
+            "endpoints_tested": [],
+        }
+        if not key:
+            result["error"] = "Steam API key not configured."
+            return result
+
+        # Probes never raise; gather keeps STEAM_TEST_ENDPOINTS order. The
+        # Steam throttle still spaces the sends, but each round trip overlaps
+        # the wait for the next token instead of adding to it.
+        result["endpoints_tested"] = list(await asyncio.gather(*(
+            self._probe_steam(endpoint, {id_param: steam_id_64})
+            for endpoint, id_param in STEAM_TEST_ENDPOINTS
+        )))
+
+        tested = result["endpoints_tested"]
+        result["api_key_valid"] = any(ep["status"] == "success" for ep in tested)
+        if all(ep["status"] == "success" for ep in tested):
+            result["status"] = "success"
+        else:
+            failed = next(ep for ep in tested if ep["status"] != "success")
+            result["error"] = (
+                f"{failed['endpoint']} returned HTTP {failed['response_code']}"
+                if failed["response_code"]
+                else f"{failed['endpoint']} is unreachable"
+            )
+        return result
+
+    async def _probe_steam(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Issue one uncached Steam API request and report its HTTP status."""
+        url = f"{STEAM_API_BASE}/{endpoint}"
+        code: Optional[int] = None
+        try:
+            session = await self._ensure_session()
+            await self._wait_for_budget("steam")
+            async with session.get(
+                url,
+                params={**params, "key": self.steam_api_key},
+            ) as resp:
+                code = resp.status
+        except Exception as exc:
+            logger.error(f"Steam probe failed for {endpoint}: {exc}")
+        return {
+            "endpoint": endpoint,
+            "status": "success" if code == 200 else "failed",
+            "response_code": code,
+        }
 
 
 # ---------------------------------------------------------------------------
-# HTTP helper
+# Helpers
 # ---------------------------------------------------------------------------
 
-async def _http_get(url: str, params: Optional[Dict[str, Any]] = None) -> Any:
-    """Perform an async GET request, return parsed JSON or None."""
+def create_http_session() -> aiohttp.ClientSession:
+    """Keep-alive session for the Steam and OpenDota APIs (create inside a running loop)."""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=32,
+            keepalive_timeout=75,
+            ttl_dns_cache=300,
+        ),
+        timeout=_HTTP_TIMEOUT,
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def game_mode_name(mode_id: int) -> str:
+    """Resolve game mode name by ID (unknown IDs → "Mode #<id>")."""
+    if isinstance(mode_id, int) and 0 <= mode_id < len(_GAME_MODE_NAMES):
+        return _GAME_MODE_NAMES[mode_id] or f"Mode #{mode_id}"
+    return f"Mode #{mode_id}"
+
+
+@functools.lru_cache(maxsize=256)
+def unknown_hero_label(hero_id: int) -> str:
+    """Placeholder name for a hero missing from the /heroes list."""
+    return f"Hero #{hero_id}"
+
+
+async def _none() -> None:
+    """Placeholder awaitable for a skipped lookup in a gather."""
+    return None
+
+
+def _format_utc(timestamp: int) -> str:
+    """Format a Unix timestamp as "YYYY-MM-DD HH:MM UTC" (no strftime parsing)."""
+    t = time.gmtime(timestamp)
+    return f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} {t.tm_hour:02d}:{t.tm_min:02d} UTC"
+
+
+def _extract_hero_names(doc: Any) -> Optional[Mapping[int, str]]:
+    """Read-only hero_id → localized name map from the OpenDota /heroes list."""
+    if not isinstance(doc, _ARRAY_TYPES):
+        return None
+    return MappingProxyType({
+        hero["id"]: hero.get("localized_name", f"Hero {hero['id']}")
+        for hero in doc
+    })
+
+
+def _buff_list(raw_buffs: Any) -> List[Dict[str, Any]]:
+    """Map OpenDota permanent_buffs entries to [{name, stack_count}, ...]."""
+    if not raw_buffs:
+        return []
+    buff_get = BUFF_NAMES.get
+    # the f-string is only built for unknown buff IDs
+    return [
+        {
+            "name": buff_get(buff_id := b.get("permanent_buff", 0)) or f"Buff #{buff_id}",
+            "stack_count": b.get("stack_count", 1),
+        }
+        for b in raw_buffs
+    ]
+
+
+def _find_live_match(account_id: int, doc: Any) -> Optional[Dict[str, Any]]:
+    """
+    Return the /live entry the player takes part in, or {} when not live.
+
+    Only the match that hits is converted to a dict.  The miss result is {}
+    rather than None so it is cached like any other response.
+    """
+    if not isinstance(doc, _ARRAY_TYPES):
+        return None
+    # OpenDota /live uses integer 32-bit account IDs (null for anonymous players)
+    match = next(
+        (
+            m for m in doc
+            if any(p.get("account_id") == account_id for p in m.get("players") or ())
+        ),
+        None,
+    )
+    if match is None:
+        return {}
+    return match.as_dict() if hasattr(match, "as_dict") else match
+
+
+def _match_ttl(match: Dict[str, Any]) -> float:
+    """Cache finished matches forever; anything without a result only briefly."""
+    return MATCH_TTL if match.get("radiant_win") is not None else LIVE_TTL
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Capped exponential backoff with jitter in [delay/2, delay]."""
+    delay = min(BACKOFF_CAP, BACKOFF_FACTOR * (2 ** attempt))
+    return delay * (0.5 + random.random() * 0.5)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds form only)."""
+    if not value:
+        return None
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=15)) as resp:
-                if resp.status == 200:
-                    return await resp.json(content_type=None)
-                logger.warning(f"HTTP {resp.status} for {url}")
-                return None
-    except asyncio.TimeoutError:
-        logger.error(f"Timeout fetching {url}")
+        return max(0.0, float(value))
+    except ValueError:
         return None
-    except Exception as exc:
-        logger.error(f"HTTP error for {url}: {exc}")
-        return None
\ No newline at end of file
+
+
+def _extractor_key(extract: Optional[Callable[[Any], Any]]) -> Any:
+    """Cache-key part for an extractor; partials also key on their bound args."""
+    if isinstance(extract, functools.partial):
+        return (extract.func.__qualname__, extract.args)
+    return getattr(extract, "__qualname__", None)
+
+
+def _decode(raw: bytes, extract: Optional[Callable[[Any], Any]] = None) -> Any:
+    """
+    Parse a JSON response body.
+
+    With ``extract`` and pysimdjson available, the extractor walks a lazy
+    document so only the keys it touches become Python objects.  Extractors
+    must return plain Python values: the document is released on return.
+    """
+    if extract is None:
+        return _json.loads(raw)
+    if _SIMD_PARSER is None:
+        return extract(_json.loads(raw))
+    doc = _SIMD_PARSER.parse(raw)
+    try:
+        return extract(doc)
+    finally:
+        del doc
+
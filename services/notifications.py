@@ -1,22 +1,42 @@
 """Notification service for sending messages to users."""
 import asyncio
-from typing import List, Optional
+import time
+from typing import ClassVar, Iterable, List, Optional, Tuple
 
 from aiogram import Bot
 from loguru import logger
 
 from config import get_settings
 from database import DatabaseRepository
+from database.models import User
+
+
+# Concurrent sends per broadcast (Telegram allows ~30 messages/sec per bot)
+BROADCAST_CONCURRENCY = 20
+
+# Seconds the authorized-users list is reused between broadcasts
+USERS_CACHE_TTL = 30
 
 
 class NotificationService:
     """Service for sending notifications to users."""
     
+    # Shared by all instances so overlapping broadcasts stay within the limit
+    _broadcast_slots: ClassVar[asyncio.Semaphore] = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+    # (monotonic time loaded, authorized users); cleared on auth/notify changes
+    _users_cache: ClassVar[Optional[Tuple[float, List[User]]]] = None
+    # Bumped on invalidation so a fetch that started earlier is not stored
+    _users_generation: ClassVar[int] = 0
+    
     def __init__(self, bot: Bot):
         """Initialize notification service."""
         self.bot = bot
         self.db = DatabaseRepository()
         self.settings = get_settings()
+        # Snapshot the flags read on every notification
+        self._notify_pc = bool(self.settings.notify_on_pc_status)
+        self._notify_dota = bool(self.settings.notify_on_dota_game)
+        self._admin_ids = tuple(self.settings.admin_ids)
     
     async def notify_admins(
         self,
@@ -33,20 +53,7 @@ class NotificationService:
         Returns:
             Number of messages sent
         """
-        sent_count = 0
-        
-        for admin_id in self.settings.admin_ids:
-            try:
-                await self.bot.send_message(
-                    admin_id,
-                    message,
-                    parse_mode=parse_mode,
-                )
-                sent_count += 1
-            except Exception as e:
-                logger.error(f"Failed to send admin notification to {admin_id}: {e}")
-        
-        return sent_count
+        return await self._broadcast(self._admin_ids, message, parse_mode)
     
     async def notify_all_users(
         self,
@@ -63,24 +70,44 @@ class NotificationService:
         Returns:
             Number of messages sent
         """
+        users = await self._get_authorized_users()
+        return await self._broadcast(
+            (user.telegram_id for user in users if user.notifications_enabled),
+            message,
+            parse_mode,
+        )
+    
+    async def _get_authorized_users(self) -> List[User]:
+        """Authorized users, reused for USERS_CACHE_TTL seconds."""
+        cached = NotificationService._users_cache
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < USERS_CACHE_TTL:
+            return cached[1]
+        generation = NotificationService._users_generation
         users = await self.db.get_all_authorized_users()
-        sent_count = 0
+        if generation == NotificationService._users_generation:
+            NotificationService._users_cache = (now, users)
+        return users
+    
+    @classmethod
+    def invalidate_users_cache(cls) -> None:
+        """Drop the cached recipients (call after authorization or opt-in changes)."""
+        cls._users_cache = None
+        cls._users_generation += 1
+    
+    async def _broadcast(
+        self,
+        chat_ids: Iterable[int],
+        message: str,
+        parse_mode: Optional[str],
+    ) -> int:
+        """Send message to all chats concurrently (bounded); return number sent."""
+        async def send_one(chat_id: int) -> bool:
+            async with self._broadcast_slots:
+                return await self.notify_user(chat_id, message, parse_mode)
         
-        for user in users:
-            if not user.notifications_enabled:
-                continue
-            
-            try:
-                await self.bot.send_message(
-                    user.telegram_id,
-                    message,
-                    parse_mode=parse_mode,
-                )
-                sent_count += 1
-            except Exception as e:
-                logger.error(f"Failed to send notification to {user.telegram_id}: {e}")
-        
-        return sent_count
+        results = await asyncio.gather(*(send_one(chat_id) for chat_id in chat_ids))
+        return sum(results)
     
     async def notify_user(
         self,
@@ -122,7 +149,7 @@ class NotificationService:
             is_online: Whether PC is now online
             ip_address: PC IP address
         """
-        if not self.settings.notify_on_pc_status:
+        if not self._notify_pc:
             return
         
         status_text = "🟢 <b>ONLINE</b>" if is_online else "🔴 <b>OFFLINE</b>"
@@ -145,7 +172,7 @@ class NotificationService:
         Args:
             match_info: Match information
         """
-        if not self.settings.notify_on_dota_game:
+        if not self._notify_dota:
             return
         
         k = match_info.get("kills", 0)
@@ -178,7 +205,7 @@ class NotificationService:
             player_name: Player name
             hero: Hero being played
         """
-        if not self.settings.notify_on_dota_game:
+        if not self._notify_dota:
             return
         
         hero_text = f"\nHero: {hero}" if hero else ""
@@ -223,6 +250,7 @@ class NotificationService:
         Args:
             telegram_id: User's Telegram ID
         """
+        self.invalidate_users_cache()
         message = (
             f"✅ <b>Authorization Approved</b>\n\n"
             f"You now have access to all bot commands!"
@@ -240,6 +268,7 @@ class NotificationService:
         Args:
             telegram_id: User's Telegram ID
         """
+        self.invalidate_users_cache()
         message = (
             f"❌ <b>Authorization Rejected</b>\n\n"
             f"Your access request was denied."
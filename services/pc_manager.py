@@ -1,14 +1,21 @@
 """PC Manager Service — Cross-platform (Windows/Linux)."""
 
 import asyncio
+import functools
+import heapq
+import io
 import os
 import platform
+import random
 import shlex
 import socket
-import tempfile
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple, TypeVar
 
 import psutil
 from loguru import logger
@@ -17,6 +24,70 @@ from config import get_settings
 
 settings = get_settings()
 
+T = TypeVar("T")
+
+# psutil calls block (syscalls, /proc reads); keep them off the event loop
+_PSUTIL_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="psutil")
+
+# Prime the system-wide CPU counter so later interval=None calls return the
+# usage since the previous call instead of sleeping for a sample
+psutil.cpu_percent(interval=None)
+
+# The hostname does not change over the bot's lifetime; skip uname() per call
+_HOSTNAME = socket.gethostname()
+
+# Constant for the life of the boot; psutil re-reads /proc/stat on every call
+_BOOT_TIME = psutil.boot_time()
+
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Bytes of stdout/stderr kept per command; the bot shows at most ~4 KB, so
+# anything past this is dropped and the process is killed
+MAX_COMMAND_OUTPUT = 64 * 1024
+_TRUNCATED_NOTE = "\n…(truncated)"
+
+# Reachability probes are reused for ~5 s; the jitter keeps callers that
+# cached together from all re-probing in the same instant
+ONLINE_CACHE_TTL = 5.0
+ONLINE_CACHE_JITTER = 0.5
+
+# SO_LINGER on, 0 s: close() sends RST, so probes leave no TIME_WAIT sockets
+_LINGER_RST = struct.pack("ii", 1, 0)
+
+
+def _png_bytes(img: Any) -> bytes:
+    """Encode a PIL image as PNG in memory."""
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+async def _read_capped(
+    stream: asyncio.StreamReader, proc: asyncio.subprocess.Process
+) -> Tuple[bytes, bool]:
+    """Read a pipe up to MAX_COMMAND_OUTPUT bytes.
+
+    Kills ``proc`` once the cap is exceeded so neither pipe keeps filling;
+    returns the kept bytes and whether output was cut off.
+    """
+    buf = bytearray()
+    while True:
+        chunk = await stream.read(MAX_COMMAND_OUTPUT + 1 - len(buf))
+        if not chunk:
+            return bytes(buf), False
+        buf += chunk
+        if len(buf) > MAX_COMMAND_OUTPUT:
+            if proc.returncode is None:
+                proc.kill()
+            return bytes(buf[:MAX_COMMAND_OUTPUT]), True
+
+
+async def _run_blocking(func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking psutil helper in the psutil thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_PSUTIL_POOL, functools.partial(func, *args))
+
 
 class PCManager:
     """Manages local PC: status, processes, commands, screenshots.
@@ -36,9 +107,18 @@ class PCManager:
         "systeminfo", "ver", "whoami", "netstat", "tasklist",
     ])
 
+    # (ip, port) -> (expires_at, online); shared because handlers build a
+    # fresh PCManager per command
+    _online_cache: ClassVar[Dict[Tuple[str, int], Tuple[float, bool]]] = {}
+
+    # Environment for the X11 screenshot tools, built on first use
+    _screenshot_env: ClassVar[Optional[Dict[str, str]]] = None
+
     def __init__(self) -> None:
         self.ip_address = settings.pc_ip_address
         self.os_type = self._detect_os()
+        # Probe RDP on Windows hosts, SSH elsewhere
+        self.default_probe_port = 3389 if self._is_windows() else 22
         
     def _detect_os(self) -> str:
         """Detect the operating system."""
@@ -54,24 +134,48 @@ class PCManager:
     # Connectivity
     # ------------------------------------------------------------------
 
-    async def check_online(self, port: int = 22, timeout: float = 3.0) -> bool:
-        """Check if the machine is reachable."""
-        loop = asyncio.get_event_loop()
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.setblocking(False)
+    async def check_online(
+        self, port: Optional[int] = None, timeout: float = 3.0, force: bool = False
+    ) -> bool:
+        """Check if the machine is reachable.
+
+        ``port`` defaults to the platform's remote-access port.  Results
+        are cached for about ONLINE_CACHE_TTL seconds; pass ``force=True``
+        to probe regardless.
+        """
+        if port is None:
+            port = self.default_probe_port
+        key = (self.ip_address, port)
+        cached = self._online_cache.get(key)
+        if not force and cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        online = await self._probe(port, timeout)
+        ttl = random.uniform(
+            ONLINE_CACHE_TTL - ONLINE_CACHE_JITTER, ONLINE_CACHE_TTL + ONLINE_CACHE_JITTER
+        )
+        self._online_cache[key] = (time.monotonic() + ttl, online)
+        return online
+
+    async def _probe(self, port: int, timeout: float) -> bool:
+        """Open and close one TCP connection to the machine."""
         try:
-            await asyncio.wait_for(
-                loop.sock_connect(sock, (self.ip_address, port)),
+            # On timeout wait_for cancels the connect, which closes its socket
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.ip_address, port),
                 timeout=timeout,
             )
-            return True
-        except Exception:
+        except (OSError, asyncio.TimeoutError):
             return False
-        finally:
-            try:
-                sock.close()
-            except Exception:
-                pass
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RST)
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
 
     # ------------------------------------------------------------------
     # System info
@@ -79,15 +183,18 @@ class PCManager:
 
     async def get_system_info(self) -> Dict[str, Any]:
         """Return basic system metrics via psutil."""
+        return await _run_blocking(self._system_info_sync)
+
+    def _system_info_sync(self) -> Dict[str, Any]:
         try:
-            cpu = psutil.cpu_percent(interval=1)
+            cpu = psutil.cpu_percent(interval=None)
             mem = psutil.virtual_memory()
             disk = psutil.disk_usage("/")
-            uptime_sec = int(datetime.now().timestamp() - psutil.boot_time())
+            uptime_sec = int(time.time() - _BOOT_TIME)
             uptime_str = self._format_uptime(uptime_sec)
 
             info = {
-                "hostname": socket.gethostname(),
+                "hostname": _HOSTNAME,
                 "os": platform.system(),
                 "os_version": platform.version() if self._is_windows() else platform.release(),
                 "cpu_percent": cpu,
@@ -147,6 +254,9 @@ class PCManager:
 
     async def get_disk_partitions(self) -> List[Dict[str, Any]]:
         """Get all disk partitions."""
+        return await _run_blocking(self._disk_partitions_sync)
+
+    def _disk_partitions_sync(self) -> List[Dict[str, Any]]:
         try:
             partitions = []
             for part in psutil.disk_partitions():
@@ -170,6 +280,9 @@ class PCManager:
 
     async def get_network_interfaces(self) -> List[Dict[str, Any]]:
         """Get network interface information."""
+        return await _run_blocking(self._network_interfaces_sync)
+
+    def _network_interfaces_sync(self) -> List[Dict[str, Any]]:
         try:
             interfaces = []
             net_if = psutil.net_io_counters(pernic=True)
@@ -190,15 +303,21 @@ class PCManager:
 
     async def get_running_processes(self, limit: int = 15) -> List[Dict[str, Any]]:
         """Return top processes sorted by memory usage."""
+        return await _run_blocking(self._running_processes_sync, limit)
+
+    def _running_processes_sync(self, limit: int) -> List[Dict[str, Any]]:
         try:
             procs = []
+            # process_iter keeps Process objects between calls (new PIDs only;
+            # no per-PID reuse check since psutil 6), so cpu_percent is a real
+            # delta from the previous poll rather than 0.0
             for p in psutil.process_iter(["pid", "name", "memory_percent", "cpu_percent", "status", "username"]):
-                try:
-                    procs.append(p.info)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-            procs.sort(key=lambda x: x.get("memory_percent") or 0, reverse=True)
-            return procs[:limit]
+                info = p.info
+                # Sort key read once per process (None for AccessDenied fields)
+                procs.append((info.get("memory_percent") or 0.0, info))
+            # Top-K: O(N log K) instead of sorting every process
+            top = heapq.nlargest(limit, procs, key=itemgetter(0))
+            return [info for _, info in top]
         except Exception as exc:
             logger.error(f"get_running_processes error: {exc}")
             return []
@@ -237,6 +356,9 @@ class PCManager:
 
     async def get_process_by_pid(self, pid: int) -> Optional[Dict[str, Any]]:
         """Get detailed info about a specific process."""
+        return await _run_blocking(self._process_by_pid_sync, pid)
+
+    def _process_by_pid_sync(self, pid: int) -> Optional[Dict[str, Any]]:
         try:
             p = psutil.Process(pid)
             return {
@@ -256,19 +378,29 @@ class PCManager:
             logger.error(f"get_process_by_pid({pid}) error: {exc}")
             return None
 
-    async def get_network_connections(self) -> List[Dict[str, Any]]:
-        """Return established TCP connections (limited to 20)."""
+    async def get_network_connections(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Return established TCP connections (first ``limit``)."""
+        return await _run_blocking(self._network_connections_sync, limit)
+
+    def _network_connections_sync(self, limit: int) -> List[Dict[str, Any]]:
         try:
             result = []
             for c in psutil.net_connections(kind="tcp"):
-                if c.status == "ESTABLISHED":
-                    result.append({
-                        "laddr": f"{c.laddr.ip}:{c.laddr.port}" if c.laddr else "",
-                        "raddr": f"{c.raddr.ip}:{c.raddr.port}" if c.raddr else "",
-                        "pid": c.pid,
-                        "status": c.status,
-                    })
-            return result[:20]
+                if c.status != psutil.CONN_ESTABLISHED:
+                    continue
+                # addr is an (ip, port) namedtuple: format it by unpacking
+                laddr = "%s:%d" % c.laddr if c.laddr else ""
+                raddr = "%s:%d" % c.raddr if c.raddr else ""
+                result.append({
+                    "laddr": laddr,
+                    "raddr": raddr,
+                    "pid": c.pid,
+                    "status": c.status,
+                })
+                # Stop formatting once enough rows are collected
+                if len(result) >= limit:
+                    break
+            return result
         except Exception as exc:
             logger.error(f"get_network_connections error: {exc}")
             return []
@@ -283,10 +415,10 @@ class PCManager:
             if self._is_windows():
                 # Windows: shutdown /r /t <seconds>
                 delay_seconds = delay_minutes * 60
-                cmd = f"shutdown /r /t {delay_seconds} /c \"Reboot initiated via Telegram bot\""
+                cmd = ["shutdown", "/r", "/t", str(delay_seconds), "/c", "Reboot initiated via Telegram bot"]
             else:
                 # Linux: shutdown -r +<minutes>
-                cmd = f"shutdown -r +{delay_minutes} 'Reboot initiated via Telegram bot'"
+                cmd = ["shutdown", "-r", f"+{delay_minutes}", "Reboot initiated via Telegram bot"]
             
             await self._run_cmd(cmd)
             logger.warning(f"Reboot scheduled in {delay_minutes}m")
@@ -301,10 +433,10 @@ class PCManager:
             if self._is_windows():
                 # Windows: shutdown /s /t <seconds>
                 delay_seconds = delay_minutes * 60
-                cmd = f"shutdown /s /t {delay_seconds} /c \"Shutdown initiated via Telegram bot\""
+                cmd = ["shutdown", "/s", "/t", str(delay_seconds), "/c", "Shutdown initiated via Telegram bot"]
             else:
                 # Linux: shutdown -h +<minutes>
-                cmd = f"shutdown -h +{delay_minutes} 'Shutdown initiated via Telegram bot'"
+                cmd = ["shutdown", "-h", f"+{delay_minutes}", "Shutdown initiated via Telegram bot"]
             
             await self._run_cmd(cmd)
             logger.warning(f"Shutdown scheduled in {delay_minutes}m")
@@ -318,13 +450,10 @@ class PCManager:
         try:
             if self._is_windows():
                 # Windows: use rundll32 for sleep
-                cmd = "rundll32.exe powrprof.dll,SetSuspendState 0,0,0"
+                cmd = ["rundll32.exe", "powrprof.dll,SetSuspendState", "0,0,0"]
             else:
-                # Linux: systemctl suspend or pm-suspend
-                try:
-                    cmd = "systemctl suspend"
-                except:
-                    cmd = "pm-suspend"
+                # Linux: systemctl suspend
+                cmd = ["systemctl", "suspend"]
             
             await self._run_cmd(cmd)
             logger.info("System sleep initiated")
@@ -337,10 +466,10 @@ class PCManager:
         """Put the system into hibernate mode."""
         try:
             if self._is_windows():
-                cmd = "rundll32.exe powrprof.dll,SetSuspendState 1,0,0"
+                cmd = ["rundll32.exe", "powrprof.dll,SetSuspendState", "1,0,0"]
             else:
                 # Linux hibernate (requires swap)
-                cmd = "systemctl hibernate"
+                cmd = ["systemctl", "hibernate"]
             
             await self._run_cmd(cmd)
             logger.info("System hibernate initiated")
@@ -353,9 +482,9 @@ class PCManager:
         """Cancel a pending shutdown/reboot."""
         try:
             if self._is_windows():
-                cmd = "shutdown /a"
+                cmd = ["shutdown", "/a"]
             else:
-                cmd = "shutdown -c"
+                cmd = ["shutdown", "-c"]
             
             await self._run_cmd(cmd)
             return True
@@ -417,18 +546,34 @@ class PCManager:
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
             )
-            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=30)
+            # The deadline covers both pipes and the exit: a child may close
+            # its pipes and keep running
+            (stdout, out_cut), (stderr, err_cut), _ = await asyncio.wait_for(
+                asyncio.gather(
+                    _read_capped(proc.stdout, proc),
+                    _read_capped(proc.stderr, proc),
+                    proc.wait(),
+                ),
+                timeout=30,
+            )
             output = stdout.decode("utf-8", errors="replace").strip()
             error = stderr.decode("utf-8", errors="replace").strip()
+            if out_cut:
+                output += _TRUNCATED_NOTE
+            if err_cut:
+                error += _TRUNCATED_NOTE
             logger.info(f"Command executed: {tokens!r} → rc={proc.returncode}")
             return {
-                "success": proc.returncode == 0,
+                "success": proc.returncode == 0 and not (out_cut or err_cut),
                 "output": output,
                 "error": error,
             }
         except asyncio.TimeoutError:
-            proc.kill()
-            await proc.communicate()
+            if proc.returncode is None:
+                proc.kill()
+            # wait(), not communicate(): a backgrounded grandchild may still
+            # hold the pipes open, so reading them to EOF could block
+            await proc.wait()
             return {"success": False, "output": "", "error": "Command timed out (30s)"}
         except FileNotFoundError:
             return {
@@ -450,40 +595,30 @@ class PCManager:
         - Windows: mss, pyautogui, PIL
         - Linux: scrot, import, gnome-screenshot, etc.
         """
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-            tmp_path = tmp.name
-
-        try:
-            # Try mss (works on both Windows and Linux)
-            data = await self._screenshot_mss(tmp_path)
-            if data:
-                return data
-            
-            # Try pyautogui
-            data = await self._screenshot_pyautogui(tmp_path)
-            if data:
-                return data
-                
-            # OS-specific methods
-            if self._is_windows():
-                data = await self._screenshot_windows_pil(tmp_path)
-            else:
-                data = await self._screenshot_linux_tools(tmp_path)
+        # Every method returns PNG bytes in memory; nothing touches the disk
+        # Try mss (works on both Windows and Linux)
+        data = await self._screenshot_mss()
+        if data:
+            return data
+        
+        # Try pyautogui
+        data = await self._screenshot_pyautogui()
+        if data:
+            return data
             
-            if data:
-                return data
-                
-        finally:
-            # Cleanup
-            try:
-                Path(tmp_path).unlink(missing_ok=True)
-            except:
-                pass
+        # OS-specific methods
+        if self._is_windows():
+            data = await self._screenshot_windows_pil()
+        else:
+            data = await self._screenshot_linux_tools()
+        
+        if data:
+            return data
         
         logger.error("All screenshot methods failed")
         return None
 
-    async def _screenshot_mss(self, path: str) -> Optional[bytes]:
+    async def _screenshot_mss(self) -> Optional[bytes]:
         """Try using mss library."""
         try:
             import mss
@@ -503,80 +638,75 @@ class PCManager:
             logger.debug(f"mss screenshot failed: {exc}")
         return None
 
-    async def _screenshot_pyautogui(self, path: str) -> Optional[bytes]:
+    async def _screenshot_pyautogui(self) -> Optional[bytes]:
         """Try using pyautogui."""
         try:
             import pyautogui
             
             img = pyautogui.screenshot()
             if img:
-                img.save(path)
-                p = Path(path)
-                if p.exists() and p.stat().st_size > 0:
+                data = _png_bytes(img)
+                if data:
                     logger.info("Screenshot captured via pyautogui")
-                    return p.read_bytes()
+                    return data
         except ImportError:
             logger.debug("pyautogui not installed")
         except Exception as exc:
             logger.debug(f"pyautogui screenshot failed: {exc}")
         return None
 
-    async def _screenshot_windows_pil(self, path: str) -> Optional[bytes]:
+    async def _screenshot_windows_pil(self) -> Optional[bytes]:
         """Windows-specific screenshot using PIL."""
         try:
             from PIL import ImageGrab
             
             img = ImageGrab.grab()
             if img:
-                img.save(path)
-                p = Path(path)
-                if p.exists() and p.stat().st_size > 0:
+                data = _png_bytes(img)
+                if data:
                     logger.info("Screenshot captured via PIL/ImageGrab")
-                    return p.read_bytes()
+                    return data
         except ImportError:
             logger.debug("PIL not installed")
         except Exception as exc:
             logger.debug(f"PIL screenshot failed: {exc}")
         return None
 
-    async def _screenshot_linux_tools(self, path: str) -> Optional[bytes]:
-        """Linux-specific screenshot tools."""
-        env = os.environ.copy()
-        if "DISPLAY" not in env:
-            env["DISPLAY"] = ":0"
-        if "XAUTHORITY" not in env:
-            for candidate in [
-                Path.home() / ".Xauthority",
-                Path("/run/user/1000/gdm/Xauthority"),
-                Path("/tmp/.Xauthority-1000"),
-            ]:
-                if candidate.exists():
-                    env["XAUTHORITY"] = str(candidate)
-                    break
+    async def _screenshot_linux_tools(self) -> Optional[bytes]:
+        """Linux-specific screenshot tools, each writing PNG to stdout."""
+        env = self._get_screenshot_env()
 
+        # argv lists run without /bin/sh; only the xwd pipeline needs a shell
         tools = [
-            f"scrot '{path}'",
-            f"import -window root '{path}'",
-            f"gnome-screenshot -f '{path}'",
-            f"spectacle -b -o '{path}'",
-            f"xwd -root -silent | convert xwd:- '{path}'",
+            ["scrot", "-o", "/dev/stdout"],
+            ["import", "-window", "root", "png:-"],
+            ["gnome-screenshot", "-f", "/dev/stdout"],
+            ["spectacle", "-b", "-n", "-o", "/dev/stdout"],
+            "xwd -root -silent | convert xwd:- png:-",
         ]
 
         for cmd in tools:
+            name = cmd[0] if isinstance(cmd, list) else "xwd"
             try:
-                proc = await asyncio.create_subprocess_shell(
-                    cmd,
-                    stdout=asyncio.subprocess.DEVNULL,
-                    stderr=asyncio.subprocess.PIPE,
-                    env=env,
-                )
-                _, stderr = await asyncio.wait_for(proc.communicate(), timeout=15)
-                p = Path(path)
-                if proc.returncode == 0 and p.exists() and p.stat().st_size > 0:
-                    data = p.read_bytes()
-                    logger.info(f"Screenshot captured via: {cmd.split()[0]}")
-                    return data
-                logger.debug(f"Screenshot tool '{cmd.split()[0]}' failed")
+                if isinstance(cmd, list):
+                    proc = await asyncio.create_subprocess_exec(
+                        *cmd,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.DEVNULL,
+                        env=env,
+                    )
+                else:
+                    proc = await asyncio.create_subprocess_shell(
+                        cmd,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.DEVNULL,
+                        env=env,
+                    )
+                stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=15)
+                if proc.returncode == 0 and stdout.startswith(_PNG_SIGNATURE):
+                    logger.info(f"Screenshot captured via: {name}")
+                    return stdout
+                logger.debug(f"Screenshot tool '{name}' failed")
             except Exception as exc:
                 logger.debug(f"Screenshot tool exception: {exc}")
 
@@ -596,39 +726,78 @@ class PCManager:
     async def _get_windows_services(self) -> List[Dict[str, Any]]:
         """Get Windows services status."""
         services = ["Spooler", "W32Time", "BITS", "wuauserv", "Dhcp"]
-        result = []
-        for svc in services:
+
+        async def query(svc: str) -> Dict[str, Any]:
             try:
-                proc = await asyncio.create_subprocess_shell(
-                    f'sc query {svc}',
+                proc = await asyncio.create_subprocess_exec(
+                    "sc", "query", svc,
                     stdout=asyncio.subprocess.PIPE,
                     stderr=asyncio.subprocess.PIPE,
                 )
                 stdout, _ = await proc.communicate()
                 output = stdout.decode("utf-8", errors="replace")
                 status = "running" if "RUNNING" in output else "stopped"
-                result.append({"name": svc, "status": status})
+                return {"name": svc, "status": status}
             except:
-                result.append({"name": svc, "status": "unknown"})
-        return result
+                return {"name": svc, "status": "unknown"}
+
+        # sc query takes one service at a time; overlap the spawns
+        return list(await asyncio.gather(*(query(svc) for svc in services)))
 
     async def _get_linux_services(self) -> List[Dict[str, Any]]:
         """Get Linux services status."""
         services = ["NetworkManager", "sshd", "bluetooth", "cups"]
-        result = []
-        for svc in services:
-            out = await self._run_cmd(f"systemctl is-active {svc}")
-            result.append({"name": svc, "status": out.strip()})
-        return result
+        # One systemctl call prints one state line per unit, in order
+        try:
+            out = await self._run_cmd(["systemctl", "is-active", *services])
+        except OSError:  # no systemctl on this host
+            return [{"name": svc, "status": "unknown"} for svc in services]
+        states = out.splitlines()
+        if len(states) == len(services):
+            return [
+                {"name": svc, "status": state.strip()}
+                for svc, state in zip(services, states)
+            ]
+        # Unexpected output (e.g. an error message): query units one by one
+        outs = await asyncio.gather(
+            *(self._run_cmd(["systemctl", "is-active", svc]) for svc in services)
+        )
+        return [{"name": svc, "status": o.strip()} for svc, o in zip(services, outs)]
 
     # ------------------------------------------------------------------
     # Private helpers
     # ------------------------------------------------------------------
 
-    async def _run_cmd(self, cmd: str) -> str:
-        """Run a shell command, return combined stdout+stderr as string."""
-        proc = await asyncio.create_subprocess_shell(
-            cmd,
+    @classmethod
+    def _get_screenshot_env(cls) -> Dict[str, str]:
+        """Process environment plus DISPLAY/XAUTHORITY defaults for X11 tools.
+
+        Cached once an Xauthority file is known; while none is found the
+        search is repeated, since a session may log in later.
+        """
+        if cls._screenshot_env is not None:
+            return cls._screenshot_env
+
+        env = os.environ.copy()
+        if "DISPLAY" not in env:
+            env["DISPLAY"] = ":0"
+        if "XAUTHORITY" not in env:
+            for candidate in [
+                Path.home() / ".Xauthority",
+                Path("/run/user/1000/gdm/Xauthority"),
+                Path("/tmp/.Xauthority-1000"),
+            ]:
+                if candidate.exists():
+                    env["XAUTHORITY"] = str(candidate)
+                    break
+        if "XAUTHORITY" in env:
+            cls._screenshot_env = env
+        return env
+
+    async def _run_cmd(self, argv: List[str]) -> str:
+        """Run a command (no shell), return combined stdout+stderr as string."""
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
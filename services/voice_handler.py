@@ -1,9 +1,9 @@
 """
-Voice command recognition service using OpenAI Whisper (local inference).
+Voice command recognition service using Whisper (local inference).
 
 Requirements:
-    pip install openai-whisper  (or faster-whisper for lower VRAM)
-    pacman -S ffmpeg
+    pip install faster-whisper  (CTranslate2, int8 — preferred)
+    or pip install openai-whisper + pacman -S ffmpeg  (fallback)
 
 Whisper model is loaded once and reused.  The model name is controlled by
 the WHISPER_MODEL env-var (default: "base" — fast, ~74 MB).
@@ -13,38 +13,113 @@ For better accuracy on Russian/English set WHISPER_MODEL=small or medium.
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import io
 import os
-import tempfile
-from pathlib import Path
-from typing import Optional
+import re
+import subprocess
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
 
 from loguru import logger
 
 # ---------------------------------------------------------------------------
-# Whisper loader — graceful fallback when package is absent
+# Whisper loader — faster-whisper preferred, openai-whisper as fallback,
+# graceful degradation when neither package is installed
 # ---------------------------------------------------------------------------
+_MODEL_NAME = os.getenv("WHISPER_MODEL", "base")
+_model: Any = None  # loaded by warm_up() at startup, or lazily on first use
+_model_lock = threading.Lock()
+_model_ready = threading.Event()
+
 try:
-    import whisper as _whisper  # openai-whisper
+    from faster_whisper import WhisperModel as _FasterWhisperModel
 
-    _MODEL_NAME = os.getenv("WHISPER_MODEL", "base")
-    _model: Optional[_whisper.Whisper] = None  # lazy-loaded
+    WHISPER_BACKEND: Optional[str] = "faster-whisper"
+except ImportError:
+    try:
+        import whisper as _whisper  # openai-whisper
 
-    def _get_model() -> _whisper.Whisper:
-        global _model
-        if _model is None:
-            logger.info(f"Loading Whisper model '{_MODEL_NAME}'…")
-            _model = _whisper.load_model(_MODEL_NAME)
-            logger.info("Whisper model loaded.")
-        return _model
+        WHISPER_BACKEND = "openai-whisper"
+    except ImportError:
+        WHISPER_BACKEND = None
 
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
+WHISPER_AVAILABLE = WHISPER_BACKEND is not None
+if not WHISPER_AVAILABLE:
     logger.warning(
-        "openai-whisper not installed. Voice commands disabled. "
-        "Install with: pip install openai-whisper"
+        "Whisper not installed. Voice commands disabled. "
+        "Install with: pip install faster-whisper"
     )
 
+# Whisper models expect 16 kHz mono float32 PCM
+_SAMPLE_RATE = 16000
+
+# Transcripts of recent clips, keyed by BLAKE2b of the audio bytes: the same
+# audio always yields the same text, so re-sent commands skip inference
+_TRANSCRIPT_CACHE_MAX = 128
+_transcripts: "OrderedDict[bytes, str]" = OrderedDict()
+
+
+def _get_model() -> Any:
+    global _model
+    if _model is not None:
+        return _model
+    # Warm-up thread and a first voice message may race; load only once
+    with _model_lock:
+        if _model is not None:
+            return _model
+        logger.info(f"Loading Whisper model '{_MODEL_NAME}' ({WHISPER_BACKEND})…")
+        if WHISPER_BACKEND == "faster-whisper":
+            # int8 CTranslate2 kernels: ~4x faster than FP32 PyTorch on CPU
+            _model = _FasterWhisperModel(_MODEL_NAME, device="auto", compute_type="int8")
+        else:
+            _model = _whisper.load_model(_MODEL_NAME)
+        _model_ready.set()
+        logger.info("Whisper model loaded.")
+    return _model
+
+
+def _log_warm_up_result(future: asyncio.Future) -> None:
+    """Done-callback for warm_up(): surface a failed background load."""
+    if future.cancelled():
+        logger.warning("Whisper warm-up was cancelled")
+    elif future.exception() is not None:
+        logger.opt(exception=future.exception()).error("Whisper warm-up failed")
+
+
+def _decode_pcm(ogg_bytes: bytes) -> Any:
+    """
+    Decode OGG/Opus bytes to a 16 kHz mono float32 numpy array in memory.
+
+    Uses PyAV when installed; otherwise pipes the bytes through ffmpeg's
+    stdin/stdout, which still avoids the temp file round-trip.
+    """
+    import numpy as np  # shipped with either Whisper backend
+
+    try:
+        import av
+    except ImportError:
+        pcm = subprocess.run(
+            [
+                "ffmpeg", "-nostdin", "-loglevel", "error", "-i", "pipe:0",
+                "-f", "s16le", "-ac", "1", "-ar", str(_SAMPLE_RATE), "pipe:1",
+            ],
+            input=ogg_bytes,
+            capture_output=True,
+            check=True,
+        ).stdout
+        return np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+
+    resampler = av.AudioResampler(format="flt", layout="mono", rate=_SAMPLE_RATE)
+    chunks = []
+    with av.open(io.BytesIO(ogg_bytes)) as container:
+        for frame in container.decode(audio=0):
+            chunks.extend(out.to_ndarray().reshape(-1) for out in resampler.resample(frame))
+        # Flush samples buffered inside the resampler
+        chunks.extend(out.to_ndarray().reshape(-1) for out in resampler.resample(None))
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+
 
 # ---------------------------------------------------------------------------
 # Command vocabulary — keyword → normalized command token
@@ -84,6 +159,16 @@ COMMAND_MAP: dict[str, str] = {
     "разбуди компьютер": "wake",
 }
 
+# Keys are matched against lowercased text, so normalise them once here
+COMMAND_MAP = {phrase.lower(): command for phrase, command in COMMAND_MAP.items()}
+
+# Phrase matcher, built once.  Phrases are ranked longest first (ties keep
+# COMMAND_MAP order); the lookahead alternation reports, at every position,
+# the highest-ranked phrase starting there, in a single C-level scan.
+_PHRASES = tuple(sorted(COMMAND_MAP, key=len, reverse=True))
+_PHRASE_RANK = {phrase: rank for rank, phrase in enumerate(_PHRASES)}
+_PHRASE_RE = re.compile("(?=(" + "|".join(map(re.escape, _PHRASES)) + "))")
+
 
 class VoiceCommandService:
     """Transcribes a Telegram voice/audio file and maps it to a bot command."""
@@ -95,6 +180,25 @@ class VoiceCommandService:
     def available(self) -> bool:
         return self._available
 
+    @property
+    def model_ready(self) -> bool:
+        return _model_ready.is_set()
+
+    @staticmethod
+    def warm_up() -> Optional[asyncio.Future]:
+        """
+        Start loading the Whisper model in the default executor.
+
+        Call once from startup so the first voice message pays only for
+        inference; the returned future need not be awaited (a load failure
+        is logged, and transcribe() retries the load on first use).
+        """
+        if not WHISPER_AVAILABLE or _model_ready.is_set():
+            return None
+        future = asyncio.get_running_loop().run_in_executor(None, _get_model)
+        future.add_done_callback(_log_warm_up_result)
+        return future
+
     async def transcribe(self, ogg_bytes: bytes) -> Optional[str]:
         """
         Transcribe raw OGG/Opus audio bytes (from Telegram voice message).
@@ -104,24 +208,41 @@ class VoiceCommandService:
         """
         if not self._available:
             return None
+        digest = hashlib.blake2b(ogg_bytes, digest_size=16).digest()
+        cached = _transcripts.get(digest)
+        if cached is not None:
+            _transcripts.move_to_end(digest)
+            logger.info(f"Whisper transcription (cached): {cached!r}")
+            return cached
 
-        with tempfile.NamedTemporaryFile(suffix=".ogg", delete=False) as f:
-            f.write(ogg_bytes)
-            tmp_path = f.name
+        if not _model_ready.is_set():
+            logger.info("Whisper model is still loading; transcription will wait for it")
 
         try:
-            loop = asyncio.get_event_loop()
-            text = await loop.run_in_executor(None, self._run_whisper, tmp_path)
-            logger.info(f"Whisper transcription: {text!r}")
-            return text
-        finally:
-            Path(tmp_path).unlink(missing_ok=True)
+            loop = asyncio.get_running_loop()
+            text = await loop.run_in_executor(None, self._run_whisper, ogg_bytes)
+        except Exception as e:
+            logger.error(f"Whisper transcription failed: {e}")
+            return None
+        logger.info(f"Whisper transcription: {text!r}")
+
+        _transcripts[digest] = text
+        if len(_transcripts) > _TRANSCRIPT_CACHE_MAX:
+            _transcripts.popitem(last=False)
+        return text
 
     @staticmethod
-    def _run_whisper(audio_path: str) -> str:
+    def _run_whisper(ogg_bytes: bytes) -> str:
         """Blocking Whisper call — executed in thread pool."""
         model = _get_model()
-        result = model.transcribe(audio_path, language=None, task="transcribe")
+        if WHISPER_BACKEND == "faster-whisper":
+            # faster-whisper decodes file-like objects in-process via PyAV;
+            # VAD skips leading/trailing silence of short voice clips
+            segments, _ = model.transcribe(
+                io.BytesIO(ogg_bytes), task="transcribe", vad_filter=True
+            )
+            return " ".join(segment.text.strip() for segment in segments).strip()
+        result = model.transcribe(_decode_pcm(ogg_bytes), language=None, task="transcribe")
         return result.get("text", "").strip()
 
     def parse_command(self, text: str) -> Optional[str]:
@@ -137,13 +258,13 @@ class VoiceCommandService:
         if text_lower in COMMAND_MAP:
             return COMMAND_MAP[text_lower]
 
-        # Substring match (first hit wins, sorted by key length descending
-        # so longer phrases match before shorter ones)
-        for phrase in sorted(COMMAND_MAP, key=len, reverse=True):
-            if phrase in text_lower:
-                return COMMAND_MAP[phrase]
-
-        return None
+        # Substring match: the longest phrase found anywhere wins
+        best = min(
+            (m.group(1) for m in _PHRASE_RE.finditer(text_lower)),
+            key=_PHRASE_RANK.__getitem__,
+            default=None,
+        )
+        return COMMAND_MAP[best] if best is not None else None
 
     # ------------------------------------------------------------------
     # Convenience: transcribe + parse in one call
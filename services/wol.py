@@ -1,16 +1,35 @@
 """Wake-on-LAN service."""
 import socket
 import asyncio
-from typing import Optional
+import functools
+from typing import ClassVar, Optional
 
 from loguru import logger
 
 from config import get_settings
 from utils.validators import sanitize_mac_address, validate_mac_address
 
+settings = get_settings()
+
+# verify_wake launches a short probe every PROBE_INTERVAL seconds without
+# waiting for the previous one, so a host is noticed soon after it boots
+PROBE_INTERVAL = 0.5
+PROBE_TIMEOUT = 1.0
+
+
+@functools.lru_cache(maxsize=32)
+def _build_packet(mac_hex: str) -> bytes:
+    """Magic packet for a 12-digit hex MAC; cached, as bytes are immutable."""
+    # One hex decode straight into the final 102-byte object
+    return bytes.fromhex('ff' * 6 + mac_hex * 16)
+
 
 class WakeOnLanService:
     """Wake-on-LAN service for powering on PCs."""
+
+    # One non-blocking broadcast socket for the whole process; handlers build
+    # a fresh service per command, so it lives on the class (see close())
+    _sock: ClassVar[Optional[socket.socket]] = None
     
     def __init__(
         self,
@@ -18,15 +37,18 @@ class WakeOnLanService:
         broadcast_address: Optional[str] = None,
     ):
         """Initialize WoL service."""
-        settings = get_settings()
-        
-        self.mac_address = mac_address or settings.pc_mac_address
         self.broadcast_address = broadcast_address or settings.pc_broadcast_address
         
-        if not validate_mac_address(self.mac_address):
-            raise ValueError(f"Invalid MAC address: {self.mac_address}")
-        
-        self.mac_address = sanitize_mac_address(self.mac_address)
+        if mac_address:
+            if not validate_mac_address(mac_address):
+                raise ValueError(f"Invalid MAC address: {mac_address}")
+            self.mac_address = sanitize_mac_address(mac_address)
+        else:
+            # Validated and normalised once per process by Settings
+            normalized = settings.pc_mac_address_normalized
+            if normalized is None:
+                raise ValueError(f"Invalid MAC address: {settings.pc_mac_address}")
+            self.mac_address = normalized
         
         # Create magic packet
         self.magic_packet = self._create_magic_packet()
@@ -39,40 +61,34 @@ class WakeOnLanService:
         - 6 bytes of 0xFF
         - 16 repetitions of the target MAC address
         """
-        # Split MAC address into bytes
-        mac_bytes = bytes.fromhex(self.mac_address.replace(':', ''))
-        
         # Create magic packet: 6x 0xFF + 16x MAC
-        return b'\xff' * 6 + mac_bytes * 16
+        return _build_packet(self.mac_address.replace(':', ''))
     
-    async def send_magic_packet(self, port: int = 9) -> bool:
+    async def send_magic_packet(self, port: int = 9, burst: int = 3) -> bool:
         """
         Send Wake-on-LAN magic packet.
         
         Args:
             port: UDP port to send packet to (default 9 for WoL)
+            burst: Copies sent back to back, in case one is dropped
             
         Returns:
             True if packet sent successfully
         """
         try:
-            # Create UDP socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-            
-            # Send packet in async-friendly way
-            loop = asyncio.get_event_loop()
-            await loop.sock_sendto(
-                sock,
-                self.magic_packet,
-                (self.broadcast_address, port)
-            )
-            
-            sock.close()
+            sock = self._get_socket()
+            address = (self.broadcast_address, port)
+            loop = asyncio.get_running_loop()
+            for _ in range(burst):
+                try:
+                    # A 102-byte datagram goes straight out on an idle socket
+                    sock.sendto(self.magic_packet, address)
+                except BlockingIOError:
+                    await loop.sock_sendto(sock, self.magic_packet, address)
             
             logger.info(
                 f"Magic packet sent to {self.mac_address} "
-                f"via {self.broadcast_address}:{port}"
+                f"via {self.broadcast_address}:{port} (x{burst})"
             )
             return True
             
@@ -80,17 +96,45 @@ class WakeOnLanService:
             logger.error(f"Failed to send magic packet: {e}")
             return False
     
-    async def wake(self, retries: int = 3, delay: float = 1.0) -> bool:
+    @classmethod
+    def _get_socket(cls) -> socket.socket:
+        """Return the shared UDP broadcast socket, creating it on first use."""
+        if cls._sock is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            sock.setblocking(False)
+            cls._sock = sock
+        return cls._sock
+
+    @classmethod
+    def close(cls) -> None:
+        """Close the shared UDP socket. Call on application shutdown."""
+        if cls._sock is not None:
+            cls._sock.close()
+            cls._sock = None
+    
+    async def wake(
+        self,
+        retries: int = 3,
+        delay: Optional[float] = None,
+        base_delay: float = 0.1,
+        max_delay: float = 2.0,
+    ) -> bool:
         """
         Send Wake-on-LAN packet with retries.
         
         Args:
             retries: Number of retry attempts
-            delay: Delay between retries in seconds
+            delay: Deprecated alias for ``base_delay``
+            base_delay: Delay before the first retry, doubled after each one
+            max_delay: Upper bound for the delay between retries
             
         Returns:
             True if at least one packet sent successfully
         """
+        if delay is not None:
+            base_delay = delay
+
         for attempt in range(retries):
             logger.info(f"Wake-on-LAN attempt {attempt + 1}/{retries}")
             
@@ -102,7 +146,7 @@ class WakeOnLanService:
                 return True
             
             if attempt < retries - 1:
-                await asyncio.sleep(delay)
+                await asyncio.sleep(min(max_delay, base_delay * 2 ** attempt))
         
         logger.error(f"Wake-on-LAN failed after {retries} attempts")
         return False
@@ -119,22 +163,19 @@ class WakeOnLanService:
         Default port is 22 (SSH) — standard on Linux.
         For Windows RDP use port 3389.
         """
-        loop = asyncio.get_event_loop()
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.setblocking(False)
         try:
-            await asyncio.wait_for(
-                loop.sock_connect(sock, (host, port)),
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port),
                 timeout=timeout,
             )
-            return True
-        except Exception:
+        except (OSError, asyncio.TimeoutError):
             return False
-        finally:
-            try:
-                sock.close()
-            except Exception:
-                pass
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
 
     async def verify_wake(
         self,
@@ -147,19 +188,44 @@ class WakeOnLanService:
 
         Uses SSH port 22 by default (Linux). Increase timeout to 60s
         because modern PCs with NVMe still need ~30s to POST + boot.
+        Probes overlap (see PROBE_INTERVAL); the first success wins.
+        Probes still in flight at the deadline get up to PROBE_TIMEOUT
+        to answer.
         """
-        settings = get_settings()
         target_ip = target_ip or settings.pc_ip_address
 
-        check_interval = 2.0
-        elapsed = 0.0
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + timeout
+        grace_end = deadline + PROBE_TIMEOUT
+        next_probe = start
+        pending: set[asyncio.Task] = set()
 
-        while elapsed < timeout:
-            if await self.check_port_open(target_ip, port):
-                logger.info(f"PC at {target_ip}:{port} is online (elapsed {elapsed:.0f}s)")
-                return True
-            await asyncio.sleep(check_interval)
-            elapsed += check_interval
+        try:
+            while (now := loop.time()) < grace_end and (now < deadline or pending):
+                if now < deadline:
+                    if now >= next_probe:
+                        pending.add(asyncio.create_task(
+                            self.check_port_open(target_ip, port, timeout=PROBE_TIMEOUT)
+                        ))
+                        next_probe = now + PROBE_INTERVAL
+                    wait = min(next_probe, deadline) - loop.time()
+                else:
+                    # No new probes; let the ones sent just before the deadline answer
+                    wait = grace_end - now
+                if not pending:
+                    await asyncio.sleep(wait)
+                    continue
+                done, pending = await asyncio.wait(
+                    pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED
+                )
+                if any(task.result() for task in done):
+                    elapsed = loop.time() - start
+                    logger.info(f"PC at {target_ip}:{port} is online (elapsed {elapsed:.0f}s)")
+                    return True
+        finally:
+            for task in pending:
+                task.cancel()
 
         logger.warning(f"PC at {target_ip} did not come online within {timeout}s")
         return False
\ No newline at end of file
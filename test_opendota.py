@@ -3,76 +3,92 @@
 
 import asyncio
 import sys
+import traceback
 from pathlib import Path
+from typing import Callable
 
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from services.dota_monitor import DotaMonitor
+from services.dota_monitor import OPENDOTA_BASE, DotaMonitor
 
 
 async def main():
     """Test OpenDota API connection."""
-    print("=" * 60)
-    print("OpenDota API Test")
-    print("=" * 60)
+    lines: list[str] = []
+    try:
+        return await _run(lines.append)
+    finally:
+        # All calls went through one pooled keep-alive session; release it
+        await DotaMonitor.close()
+        # Emit the whole report in one write instead of one per line
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+async def _run(emit: Callable[[str], None]) -> int:
+    emit("=" * 60)
+    emit("OpenDota API Test")
+    emit("=" * 60)
 
     monitor = DotaMonitor()
 
-    print(f"\nConfiguration:")
-    print(f"  Steam API Key: {monitor.steam_api_key[:8]}..." if monitor.steam_api_key else "  Steam API Key: NOT SET")
-    print(f"  Account ID: {monitor.account_id}" if monitor.account_id else "  Account ID: NOT SET")
-    print(f"  OpenDota URL: {monitor.opendota_url}")
+    emit(f"\nConfiguration:")
+    emit(f"  Steam API Key: {monitor.steam_api_key[:8]}..." if monitor.steam_api_key else "  Steam API Key: NOT SET")
+    emit(f"  Account ID: {monitor.account_id_32}" if monitor.account_id_32 else "  Account ID: NOT SET")
+    emit(f"  OpenDota URL: {OPENDOTA_BASE}")
 
-    print("\n" + "-" * 60)
-    print("Testing OpenDota API...")
-    print("-" * 60)
+    emit("\n" + "-" * 60)
+    emit("Testing OpenDota API...")
+    emit("-" * 60)
 
     try:
+        # Summary and history are independent: fetch them concurrently
+        player_summary, match_history = await asyncio.gather(
+            monitor.get_player_summary(),
+            monitor.get_match_history(5),
+        )
+
         # Test player summary
-        print("\n1. Testing player summary...")
-        player_summary = await monitor.get_player_summary()
+        emit("\n1. Testing player summary...")
         if player_summary:
-            print("  ✓ Player summary retrieved successfully")
-            print(f"    Name: {player_summary.get('personaname', 'Unknown')}")
-            print(f"    Rank: {player_summary.get('rank_tier', 'Unknown')}")
+            emit("  ✓ Player summary retrieved successfully")
+            emit(f"    Name: {player_summary.get('personaname', 'Unknown')}")
+            emit(f"    Rank: {player_summary.get('rank_tier', 'Unknown')}")
         else:
-            print("  ✗ Failed to retrieve player summary")
+            emit("  ✗ Failed to retrieve player summary")
 
         # Test match history
-        print("\n2. Testing match history...")
-        match_history = await monitor.get_match_history(5)
+        emit("\n2. Testing match history...")
         if match_history:
-            print("  ✓ Match history retrieved successfully")
-            print(f"    Found {len(match_history)} matches")
+            emit("  ✓ Match history retrieved successfully")
+            emit(f"    Found {len(match_history)} matches")
         else:
-            print("  ✗ Failed to retrieve match history")
+            emit("  ✗ Failed to retrieve match history")
 
         # Test match details
-        print("\n3. Testing match details...")
+        emit("\n3. Testing match details...")
         if match_history and len(match_history) > 0:
             match_id = match_history[0].get('match_id', match_history[0].get('match_id'))
             if match_id:
                 match_details = await monitor.get_match_details(match_id)
                 if match_details:
-                    print("  ✓ Match details retrieved successfully")
-                    print(f"    Match ID: {match_id}")
+                    emit("  ✓ Match details retrieved successfully")
+                    emit(f"    Match ID: {match_id}")
                 else:
-                    print("  ✗ Failed to retrieve match details")
+                    emit("  ✗ Failed to retrieve match details")
             else:
-                print("  ✗ No valid match ID found")
+                emit("  ✗ No valid match ID found")
         else:
-            print("  ✗ No matches to test details with")
+            emit("  ✗ No matches to test details with")
 
-        print("\n" + "=" * 60)
-        print("\nOpenDota API test completed!")
+        emit("\n" + "=" * 60)
+        emit("\nOpenDota API test completed!")
         return 0
 
     except Exception as e:
-        print(f"\n✗ Unexpected error: {e}")
-        import traceback
-        traceback.print_exc()
+        emit(f"\n✗ Unexpected error: {e}")
+        emit(traceback.format_exc())
         return 1
 
 
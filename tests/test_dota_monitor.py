@@ -0,0 +1,217 @@
+"""DotaMonitor HTTP layer tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from asyncio_throttle import Throttler
+
+from services import dota_monitor
+from services.dota_monitor import BACKOFF_CAP, MAX_RETRIES, DotaMonitor
+
+Reply = Tuple[int, Any, Dict[str, str]]
+
+
+class FakeOpenDota:
+    """Local stand-in for the OpenDota API with scripted replies per path."""
+
+    def __init__(self) -> None:
+        self.requests: List[web.Request] = []
+        self.replies: Dict[str, List[Reply]] = {}
+        self.gate: Optional[asyncio.Event] = None
+
+    def reply(self, path: str, *replies: Reply) -> None:
+        """Serve ``replies`` in order for ``path``; the last one repeats."""
+        self.replies[path] = list(replies)
+
+    def hits(self, path: str) -> int:
+        return sum(1 for request in self.requests if request.path == path)
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        self.requests.append(request)
+        if self.gate is not None:
+            await self.gate.wait()
+        queue = self.replies[request.path]
+        status, body, headers = queue.pop(0) if len(queue) > 1 else queue[0]
+        if status == 304 and request.headers.get("If-None-Match") != headers.get("ETag"):
+            status = 200
+        if body is None or status == 304:
+            return web.Response(status=status, headers=headers)
+        return web.json_response(body, status=status, headers=headers)
+
+
+@pytest.fixture
+def backoff_calls(monkeypatch) -> List[int]:
+    """Isolate class-level state and make backoff sleeps instant."""
+    monkeypatch.setattr(DotaMonitor, "_response_cache", OrderedDict())
+    monkeypatch.setattr(DotaMonitor, "_inflight", {})
+    monkeypatch.setattr(DotaMonitor, "_validators", OrderedDict())
+    monkeypatch.setattr(DotaMonitor, "_blocked_until", {})
+    monkeypatch.setattr(DotaMonitor, "_opendota_slots", asyncio.Semaphore(8))
+    monkeypatch.setattr(
+        DotaMonitor,
+        "_throttlers",
+        {"steam": Throttler(1000, 1.0), "opendota": Throttler(1000, 1.0)},
+    )
+    calls: List[int] = []
+
+    def no_wait(attempt: int) -> float:
+        calls.append(attempt)
+        return 0.0
+
+    monkeypatch.setattr(dota_monitor, "_backoff_delay", no_wait)
+    return calls
+
+
+@pytest.fixture
+async def api(monkeypatch, backoff_calls):
+    fake = FakeOpenDota()
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", fake.handle)
+    server = TestServer(app)
+    await server.start_server()
+    monkeypatch.setattr(dota_monitor, "OPENDOTA_BASE", str(server.make_url("/api")))
+    yield fake
+    await server.close()
+
+
+@pytest.fixture
+async def monitor(api):
+    async with aiohttp.ClientSession() as session:
+        yield DotaMonitor(steam_api_key="key", account_id="1", session=session)
+
+
+class TestRetries:
+    """_fetch retry loop: which failures are retried and how long it waits."""
+
+    @pytest.mark.asyncio
+    async def test_429_honours_retry_after_then_succeeds(self, api, monitor, backoff_calls) -> None:
+        api.reply(
+            "/api/heroes",
+            (429, None, {"Retry-After": "0.01"}),
+            (200, {"ok": 1}, {}),
+        )
+
+        assert await monitor._opendota_get("heroes") == {"ok": 1}
+        assert api.hits("/api/heroes") == 2
+        # The server-provided delay was used instead of computed backoff
+        assert backoff_calls == []
+        assert "opendota" in DotaMonitor._blocked_until
+
+    @pytest.mark.asyncio
+    async def test_retry_after_beyond_cap_fails_fast(self, api, monitor, backoff_calls) -> None:
+        api.reply(
+            "/api/heroes",
+            (429, None, {"Retry-After": str(BACKOFF_CAP * 20)}),
+            (200, {"ok": 1}, {}),
+        )
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        assert await monitor._opendota_get("heroes") is None
+        assert api.hits("/api/heroes") == 1
+        # Later calls skip the API until the pause ends instead of sleeping
+        assert await monitor._opendota_get("heroes") is None
+        assert api.hits("/api/heroes") == 1
+        assert loop.time() - start < BACKOFF_CAP
+        assert backoff_calls == []
+
+    @pytest.mark.asyncio
+    async def test_5xx_gives_up_after_max_retries(self, api, monitor, backoff_calls) -> None:
+        api.reply("/api/heroes", (503, None, {}))
+
+        assert await monitor._opendota_get("heroes") is None
+        assert api.hits("/api/heroes") == MAX_RETRIES + 1
+        assert backoff_calls == list(range(MAX_RETRIES))
+
+    @pytest.mark.asyncio
+    async def test_4xx_is_not_retried(self, api, monitor, backoff_calls) -> None:
+        api.reply("/api/heroes", (404, {"error": "not found"}, {}))
+
+        assert await monitor._opendota_get("heroes") is None
+        assert api.hits("/api/heroes") == 1
+        assert backoff_calls == []
+
+
+class TestResponseCache:
+    """_http_get: in-flight sharing, TTL expiry and cancellation."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_gets_share_one_request(self, api, monitor) -> None:
+        api.reply("/api/heroes", (200, [1, 2, 3], {}))
+        api.gate = asyncio.Event()
+
+        calls = [asyncio.ensure_future(monitor._opendota_get("heroes")) for _ in range(5)]
+        while not api.requests:
+            await asyncio.sleep(0.01)
+        api.gate.set()
+
+        assert await asyncio.gather(*calls) == [[1, 2, 3]] * 5
+        assert api.hits("/api/heroes") == 1
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry_refetches(self, api, monitor, monkeypatch) -> None:
+        clock = SimpleNamespace(now=1000.0)
+        monkeypatch.setattr(dota_monitor, "time", SimpleNamespace(monotonic=lambda: clock.now))
+        api.reply("/api/heroes", (200, {"v": 1}, {}), (200, {"v": 2}, {}))
+
+        assert await monitor._opendota_get("heroes", ttl=10) == {"v": 1}
+        clock.now += 9
+        assert await monitor._opendota_get("heroes", ttl=10) == {"v": 1}
+        assert api.hits("/api/heroes") == 1
+
+        clock.now += 2
+        assert await monitor._opendota_get("heroes", ttl=10) == {"v": 2}
+        assert api.hits("/api/heroes") == 2
+
+    @pytest.mark.asyncio
+    async def test_callable_ttl_decides_per_response(self, api, monitor) -> None:
+        api.reply("/api/matches/1", (200, {"radiant_win": None}, {}))
+
+        ttl = lambda match: 0 if match["radiant_win"] is None else 60  # noqa: E731
+        await monitor._opendota_get("matches/1", ttl=ttl)
+        await monitor._opendota_get("matches/1", ttl=ttl)
+
+        assert api.hits("/api/matches/1") == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_shared_fetch(self, api, monitor) -> None:
+        api.reply("/api/heroes", (200, {"ok": 1}, {}))
+        api.gate = asyncio.Event()
+
+        first = asyncio.ensure_future(monitor._opendota_get("heroes"))
+        second = asyncio.ensure_future(monitor._opendota_get("heroes"))
+        while not api.requests:
+            await asyncio.sleep(0.01)
+        first.cancel()
+        api.gate.set()
+
+        assert await second == {"ok": 1}
+        assert first.cancelled()
+        assert api.hits("/api/heroes") == 1
+
+
+class TestRevalidation:
+    """ETag revalidation: conditional headers and 304 reuse."""
+
+    @pytest.mark.asyncio
+    async def test_304_reuses_cached_body(self, api, monitor) -> None:
+        api.reply(
+            "/api/heroes",
+            (200, {"heroes": ["axe"]}, {"ETag": '"v1"'}),
+            (304, None, {"ETag": '"v1"'}),
+        )
+
+        assert await monitor._opendota_get("heroes") == {"heroes": ["axe"]}
+        assert await monitor._opendota_get("heroes") == {"heroes": ["axe"]}
+
+        first, second = api.requests
+        assert "If-None-Match" not in first.headers
+        assert second.headers["If-None-Match"] == '"v1"'
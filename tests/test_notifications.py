@@ -0,0 +1,118 @@
+"""NotificationService broadcast tests."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+import pytest
+
+from services.notifications import NotificationService
+
+
+class FakeBot:
+    """Records sends; chats in ``failing`` raise like a blocked user would."""
+
+    def __init__(self, failing=()) -> None:
+        self.failing = set(failing)
+        self.sent: List[int] = []
+        self.active = 0
+        self.peak = 0
+
+    async def send_message(self, chat_id: int, text: str, parse_mode=None) -> None:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0)
+            if chat_id in self.failing:
+                raise RuntimeError("Forbidden: bot was blocked by the user")
+            self.sent.append(chat_id)
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture(autouse=True)
+def slots(monkeypatch) -> None:
+    monkeypatch.setattr(NotificationService, "_broadcast_slots", asyncio.Semaphore(3))
+
+
+class TestBroadcast:
+    """_broadcast: bounded fan-out that reports how many sends succeeded."""
+
+    @pytest.mark.asyncio
+    async def test_returns_delivered_count(self) -> None:
+        bot = FakeBot()
+        service = NotificationService(bot)
+
+        assert await service._broadcast(range(10), "hi", "HTML") == 10
+        assert sorted(bot.sent) == list(range(10))
+        assert bot.peak <= 3
+
+    @pytest.mark.asyncio
+    async def test_failing_send_does_not_abort_others(self) -> None:
+        bot = FakeBot(failing={2, 5})
+        service = NotificationService(bot)
+
+        assert await service._broadcast(range(8), "hi", "HTML") == 6
+        assert sorted(bot.sent) == [0, 1, 3, 4, 6, 7]
+
+    @pytest.mark.asyncio
+    async def test_notify_admins_uses_configured_ids(self, monkeypatch) -> None:
+        bot = FakeBot()
+        service = NotificationService(bot)
+        monkeypatch.setattr(service, "_admin_ids", (11, 22))
+
+        assert await service.notify_admins("hi") == 2
+        assert sorted(bot.sent) == [11, 22]
+
+
+class FakeRepository:
+    """get_all_authorized_users() that can be held open mid-fetch."""
+
+    def __init__(self, users) -> None:
+        self.users = users
+        self.calls = 0
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def get_all_authorized_users(self):
+        self.calls += 1
+        users = list(self.users)  # the query's snapshot
+        await self.gate.wait()
+        return users
+
+
+class TestUsersCache:
+    """_get_authorized_users: TTL cache that invalidation always wins against."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self, monkeypatch) -> None:
+        monkeypatch.setattr(NotificationService, "_users_cache", None)
+        monkeypatch.setattr(NotificationService, "_users_generation", 0)
+
+    @pytest.mark.asyncio
+    async def test_second_call_is_cached(self) -> None:
+        service = NotificationService(FakeBot())
+        service.db = FakeRepository(["alice"])
+
+        assert await service._get_authorized_users() == ["alice"]
+        assert await service._get_authorized_users() == ["alice"]
+        assert service.db.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_fetch_overtaken_by_invalidation_is_not_stored(self) -> None:
+        service = NotificationService(FakeBot())
+        service.db = FakeRepository(["alice", "mallory"])
+        service.db.gate.clear()
+
+        stale = asyncio.ensure_future(service._get_authorized_users())
+        while not service.db.calls:
+            await asyncio.sleep(0)
+        # mallory is revoked while the list is still being loaded
+        service.db.users = ["alice"]
+        NotificationService.invalidate_users_cache()
+        service.db.gate.set()
+
+        assert await stale == ["alice", "mallory"]
+        assert NotificationService._users_cache is None
+        assert await service._get_authorized_users() == ["alice"]
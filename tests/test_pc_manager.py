@@ -0,0 +1,74 @@
+"""PCManager reachability cache tests."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import List, Tuple
+
+import pytest
+
+from services import pc_manager
+from services.pc_manager import ONLINE_CACHE_JITTER, ONLINE_CACHE_TTL, PCManager
+
+
+@pytest.fixture
+def clock(monkeypatch) -> SimpleNamespace:
+    """Controllable monotonic clock and an empty, per-test online cache."""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(pc_manager, "time", SimpleNamespace(monotonic=lambda: now.value))
+    monkeypatch.setattr(PCManager, "_online_cache", {})
+    return now
+
+
+@pytest.fixture
+def probes(monkeypatch) -> List[Tuple[int, float]]:
+    """Replace the TCP probe; each call is recorded and reports online."""
+    calls: List[Tuple[int, float]] = []
+
+    async def fake_probe(self, port: int, timeout: float) -> bool:
+        calls.append((port, timeout))
+        return True
+
+    monkeypatch.setattr(PCManager, "_probe", fake_probe)
+    return calls
+
+
+class TestCheckOnline:
+    """check_online caches probe results for about ONLINE_CACHE_TTL seconds."""
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_within_ttl(self, clock, probes) -> None:
+        manager = PCManager()
+
+        assert await manager.check_online(port=22) is True
+        clock.value += ONLINE_CACHE_TTL - ONLINE_CACHE_JITTER - 0.1
+        assert await manager.check_online(port=22) is True
+
+        assert probes == [(22, 3.0)]
+
+    @pytest.mark.asyncio
+    async def test_refresh_after_ttl(self, clock, probes) -> None:
+        manager = PCManager()
+
+        await manager.check_online(port=22)
+        clock.value += ONLINE_CACHE_TTL + ONLINE_CACHE_JITTER + 0.1
+        await manager.check_online(port=22)
+
+        assert len(probes) == 2
+
+    @pytest.mark.asyncio
+    async def test_force_bypasses_cache(self, clock, probes) -> None:
+        manager = PCManager()
+
+        await manager.check_online(port=22)
+        await manager.check_online(port=22, force=True)
+
+        assert len(probes) == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_is_keyed_by_port_and_shared(self, clock, probes) -> None:
+        await PCManager().check_online(port=22)
+        await PCManager().check_online(port=3389)
+        await PCManager().check_online(port=22)
+
+        assert [port for port, _ in probes] == [22, 3389]
@@ -0,0 +1,63 @@
+"""DatabaseRepository tests against a throwaway SQLite database."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from database.models import DotaMatch
+from database.repository import DatabaseRepository
+
+
+@pytest.fixture
+async def db(tmp_path):
+    repo = DatabaseRepository(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    await repo.init_db()
+    yield repo
+    await repo.engine.dispose()
+    DatabaseRepository._engine_cache.pop(repo.database_url, None)
+    DatabaseRepository._session_maker_cache.pop(repo.database_url, None)
+
+
+def _match(match_id: int) -> dict:
+    return {
+        "match_id": match_id,
+        "hero_id": 1,
+        "kills": 10,
+        "deaths": 2,
+        "assists": 7,
+        "duration": 1800,
+        "game_mode": 22,
+        "started_at": datetime(2024, 1, 1, 12, 0),
+    }
+
+
+class TestAddDotaMatches:
+    """Bulk match insert that skips already stored match_ids."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_batch_is_skipped(self, db) -> None:
+        batch = [_match(101), _match(102), _match(103)]
+
+        assert await db.add_dota_matches(batch) == 3
+        assert await db.add_dota_matches(batch) == 0
+        assert await db.add_dota_matches([_match(103), _match(104)]) == 1
+
+        async with db.async_session_maker() as session:
+            stored = (await session.execute(select(DotaMatch.match_id))).scalars().all()
+        assert sorted(stored) == [101, 102, 103, 104]
+
+    @pytest.mark.asyncio
+    async def test_column_defaults_are_applied(self, db) -> None:
+        await db.add_dota_matches([_match(201)])
+
+        async with db.async_session_maker() as session:
+            match = (await session.execute(select(DotaMatch))).scalar_one()
+        assert isinstance(match.created_at, datetime)
+        assert match.kills == 10
+
+    @pytest.mark.asyncio
+    async def test_empty_batch(self, db) -> None:
+        assert await db.add_dota_matches([]) == 0
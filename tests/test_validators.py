@@ -0,0 +1,44 @@
+"""Unit tests for input validators."""
+
+from __future__ import annotations
+
+import pytest
+
+from utils.validators import sanitize_mac_address, validate_mac_address
+
+
+class TestMacValidation:
+    """MAC address validation and normalisation tests."""
+
+    @pytest.mark.parametrize(
+        "mac",
+        [
+            "AA:BB:CC:DD:EE:FF",
+            "aa-bb-cc-dd-ee-ff",
+            "01:23-45:67-89:aB",
+            "aabb.ccdd.eeff",
+        ],
+    )
+    def test_valid_formats(self, mac: str) -> None:
+        assert validate_mac_address(mac) is True
+
+    @pytest.mark.parametrize(
+        "mac",
+        [
+            "",
+            "AA:BB:CC:DD:EE",
+            "AA:BB:CC:DD:EE:FG",
+            "AA.BB.CC.DD.EE.FF",
+            "AABB:CCDD:EEFF",
+            "AA:BB:CC:DD:EE:FF\n",
+            "aabbccddeeff",
+            "ａａ:bb:cc:dd:ee:ff",
+        ],
+    )
+    def test_invalid_formats(self, mac: str) -> None:
+        assert validate_mac_address(mac) is False
+
+    def test_sanitize_normalises_separators(self) -> None:
+        assert sanitize_mac_address("aabb.ccdd.eeff") == "AA:BB:CC:DD:EE:FF"
+        assert sanitize_mac_address("aa-bb-cc-dd-ee-ff") == "AA:BB:CC:DD:EE:FF"
+        assert sanitize_mac_address("aa:bb:cc:dd:ee:ff") == "AA:BB:CC:DD:EE:FF"
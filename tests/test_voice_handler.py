@@ -0,0 +1,105 @@
+"""Voice command phrase matching tests."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import List, Optional
+
+import pytest
+from loguru import logger
+
+from services import voice_handler
+from services.voice_handler import COMMAND_MAP, VoiceCommandService
+
+
+def longest_phrase_loop(text: str) -> Optional[str]:
+    """The original matcher: scan phrases longest first, first substring wins."""
+    text_lower = text.lower().strip()
+    if text_lower in COMMAND_MAP:
+        return COMMAND_MAP[text_lower]
+    for phrase in sorted(COMMAND_MAP, key=len, reverse=True):
+        if phrase in text_lower:
+            return COMMAND_MAP[phrase]
+    return None
+
+
+class TestParseCommand:
+    """parse_command must pick the same phrase as the longest-phrase loop."""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            # Prefix pairs: "статус" / "статус доты", "dota" / "dota status"
+            "статус",
+            "статус доты",
+            "покажи статус доты пожалуйста",
+            "dota",
+            "dota status",
+            "DOTA STATUS now",
+            # Suffix pairs: "скриншот" / "сделай скриншот", "shutdown" / "cancel shutdown"
+            "сделай скриншот",
+            "ну сделай скриншот экрана",
+            "cancel shutdown",
+            "please cancel shutdown",
+            "shutdown now",
+            # Phrases sharing a stem
+            "перезагрузка системы",
+            "перезагрузи компьютер",
+            "отмени выключение компьютера",
+            "выключение через минуту",
+            # Several unrelated phrases; the longest one wins regardless of position
+            "status and then reboot",
+            "reboot and show processes",
+            "wake и статус",
+            "  Список процессов  ",
+            # Nothing recognised
+            "",
+            "привет",
+        ],
+    )
+    def test_matches_longest_phrase_loop(self, text: str) -> None:
+        assert VoiceCommandService().parse_command(text) == longest_phrase_loop(text)
+
+    @pytest.mark.parametrize(
+        ("text", "command"),
+        [
+            ("статус доты", "dota"),
+            ("покажи dota status", "dota"),
+            ("please cancel shutdown", "cancel"),
+            ("сделай скриншот", "screenshot"),
+            ("status then reboot", "reboot"),
+        ],
+    )
+    def test_overlapping_phrases(self, text: str, command: str) -> None:
+        assert VoiceCommandService().parse_command(text) == command
+
+    @pytest.mark.parametrize("phrase", sorted(COMMAND_MAP))
+    def test_each_phrase_inside_a_sentence(self, phrase: str) -> None:
+        text = f"ну {phrase} давай"
+        assert VoiceCommandService().parse_command(text) == longest_phrase_loop(text)
+
+
+class TestWarmUp:
+    """warm_up: background model load whose failure is logged, not lost."""
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_logged(self, monkeypatch) -> None:
+        def broken_load():
+            raise RuntimeError("model file missing")
+
+        monkeypatch.setattr(voice_handler, "WHISPER_AVAILABLE", True)
+        monkeypatch.setattr(voice_handler, "_model_ready", threading.Event())
+        monkeypatch.setattr(voice_handler, "_get_model", broken_load)
+        records: List[str] = []
+        sink = logger.add(records.append, level="ERROR", format="{message}")
+        try:
+            future = VoiceCommandService.warm_up()
+            with pytest.raises(RuntimeError):
+                await future
+            await asyncio.sleep(0)
+        finally:
+            logger.remove(sink)
+
+        assert any("Whisper warm-up failed" in record for record in records)
+        assert any("model file missing" in record for record in records)
@@ -0,0 +1,164 @@
+"""Wake-on-LAN send, retry and verification tests."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import List, Tuple
+
+import pytest
+
+from services import wol
+from services.wol import WakeOnLanService
+
+MAC = "AA:BB:CC:DD:EE:FF"
+
+
+class FakeSocket:
+    """Records datagrams instead of putting them on the network."""
+
+    def __init__(self) -> None:
+        self.sent: List[Tuple[bytes, Tuple[str, int]]] = []
+
+    def sendto(self, data: bytes, address: Tuple[str, int]) -> int:
+        self.sent.append((data, address))
+        return len(data)
+
+
+@pytest.fixture
+def sock(monkeypatch) -> FakeSocket:
+    fake = FakeSocket()
+    monkeypatch.setattr(WakeOnLanService, "_sock", fake)
+    return fake
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> List[float]:
+    """Record the delays wake() asks for and return immediately."""
+    delays: List[float] = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay: float) -> None:
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(wol.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+@pytest.fixture
+def service() -> WakeOnLanService:
+    return WakeOnLanService(mac_address=MAC, broadcast_address="192.168.1.255")
+
+
+class TestSendMagicPacket:
+    """send_magic_packet: packet layout and burst size."""
+
+    @pytest.mark.asyncio
+    async def test_sends_burst_of_packets(self, service, sock) -> None:
+        assert await service.send_magic_packet(port=7, burst=4) is True
+
+        assert len(sock.sent) == 4
+        packet, address = sock.sent[0]
+        assert address == ("192.168.1.255", 7)
+        assert packet == b"\xff" * 6 + bytes.fromhex("AABBCCDDEEFF") * 16
+
+    @pytest.mark.asyncio
+    async def test_default_burst(self, service, sock) -> None:
+        await service.send_magic_packet()
+
+        assert len(sock.sent) == 3
+
+
+class TestWake:
+    """wake: retries with capped exponential backoff."""
+
+    @staticmethod
+    def failing_sends(monkeypatch, service, succeed_on: int = 0) -> List[int]:
+        attempts: List[int] = []
+
+        async def send_magic_packet() -> bool:
+            attempts.append(len(attempts) + 1)
+            return len(attempts) == succeed_on
+
+        monkeypatch.setattr(service, "send_magic_packet", send_magic_packet)
+        return attempts
+
+    @pytest.mark.asyncio
+    async def test_backoff_doubles_up_to_max_delay(self, monkeypatch, service, sleeps) -> None:
+        attempts = self.failing_sends(monkeypatch, service)
+
+        assert await service.wake(retries=6, base_delay=0.5, max_delay=3.0) is False
+        assert len(attempts) == 6
+        assert sleeps == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+    @pytest.mark.asyncio
+    async def test_delay_is_alias_for_base_delay(self, monkeypatch, service, sleeps) -> None:
+        self.failing_sends(monkeypatch, service)
+
+        await service.wake(retries=3, delay=0.25)
+
+        assert sleeps == [0.25, 0.5]
+
+    @pytest.mark.asyncio
+    async def test_stops_on_first_success(self, monkeypatch, service, sleeps) -> None:
+        attempts = self.failing_sends(monkeypatch, service, succeed_on=2)
+
+        assert await service.wake(retries=5) is True
+        assert attempts == [1, 2]
+        assert sleeps == [0.1]
+
+
+class TestVerifyWake:
+    """verify_wake: overlapping probes, first success wins."""
+
+    @pytest.fixture
+    def probes(self, monkeypatch) -> List[Tuple[str, int]]:
+        """Probe calls made by the stub; probes start every 10 ms."""
+        monkeypatch.setattr(wol, "PROBE_INTERVAL", 0.01)
+        return []
+
+    @staticmethod
+    def stub_probe(monkeypatch, calls, online_from: int, latency: float = 0.0) -> None:
+        async def check_port_open(host: str, port: int = 22, timeout: float = 3.0) -> bool:
+            calls.append((host, port))
+            online = len(calls) >= online_from
+            await asyncio.sleep(latency)
+            return online
+
+        monkeypatch.setattr(WakeOnLanService, "check_port_open", staticmethod(check_port_open))
+
+    @pytest.mark.asyncio
+    async def test_returns_on_first_successful_probe(self, monkeypatch, service, probes) -> None:
+        self.stub_probe(monkeypatch, probes, online_from=3)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        assert await service.verify_wake("10.0.0.5", port=3389, timeout=30) is True
+        assert loop.time() - start < 5
+        assert len(probes) == 3
+        assert set(probes) == {("10.0.0.5", 3389)}
+
+    @pytest.mark.asyncio
+    async def test_gives_up_at_timeout(self, monkeypatch, service, probes) -> None:
+        self.stub_probe(monkeypatch, probes, online_from=10**6)
+
+        assert await service.verify_wake("10.0.0.5", timeout=0.1) is False
+        assert probes
+
+    @pytest.mark.asyncio
+    async def test_probe_in_flight_at_deadline_may_still_answer(self, monkeypatch, service, probes) -> None:
+        monkeypatch.setattr(wol, "PROBE_TIMEOUT", 0.5)
+        # Every probe needs longer than the whole timeout to get its answer
+        self.stub_probe(monkeypatch, probes, online_from=1, latency=0.2)
+
+        assert await service.verify_wake("10.0.0.5", timeout=0.05) is True
+
+    @pytest.mark.asyncio
+    async def test_grace_period_is_bounded_by_probe_timeout(self, monkeypatch, service, probes) -> None:
+        monkeypatch.setattr(wol, "PROBE_TIMEOUT", 0.1)
+        self.stub_probe(monkeypatch, probes, online_from=1, latency=60)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        assert await service.verify_wake("10.0.0.5", timeout=0.05) is False
+        assert loop.time() - start < 1
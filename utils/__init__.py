@@ -1,6 +1,17 @@
-"""Utilities package."""
-from .logger import setup_logging, get_logger
-from .validators import validate_mac_address, validate_ip_address
+"""Utilities package.
+
+Names are loaded on first access (PEP 562), so importing only the
+validators does not pull in loguru and the settings via utils.logger.
+"""
+import importlib
+from typing import Any
+
+_LAZY = {
+    "setup_logging": ".logger",
+    "get_logger": ".logger",
+    "validate_mac_address": ".validators",
+    "validate_ip_address": ".validators",
+}
 
 __all__ = [
     "setup_logging",
@@ -8,3 +19,17 @@ __all__ = [
     "validate_mac_address",
     "validate_ip_address",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -1,12 +1,17 @@
 """Logging configuration using Loguru."""
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Set, Tuple
 
 from loguru import logger
 
 from config import get_settings
 
+# Log directories already created, and the configuration currently installed,
+# so repeated setup_logging calls (tests, reloads) are cheap no-ops
+_CREATED_DIRS: Set[Path] = set()
+_active_config: Optional[Tuple[str, str, str, int]] = None
+
 
 def setup_logging(
     log_file: Optional[str] = None,
@@ -29,6 +34,11 @@ def setup_logging(
     log_level = log_level or settings.log_level
     log_rotation = log_rotation or settings.log_rotation
     log_retention = log_retention or settings.log_retention
+
+    global _active_config
+    config = (log_file, log_level, log_rotation, log_retention)
+    if config == _active_config:
+        return
     
     # Remove default handler
     logger.remove()
@@ -42,8 +52,10 @@ def setup_logging(
     )
     
     # Add file handler
-    log_path = Path(log_file)
-    log_path.parent.mkdir(parents=True, exist_ok=True)
+    log_dir = Path(log_file).parent
+    if log_dir not in _CREATED_DIRS:
+        log_dir.mkdir(parents=True, exist_ok=True)
+        _CREATED_DIRS.add(log_dir)
     
     logger.add(
         log_file,
@@ -53,8 +65,12 @@ def setup_logging(
         retention=log_retention,
         compression="zip",
         encoding="utf-8",
+        # Writes, rotation and zipping run on loguru's worker thread, off
+        # the event loop; loguru drains the queue at exit
+        enqueue=True,
     )
     
+    _active_config = config
     logger.info("Logging initialized")
 
 
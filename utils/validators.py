@@ -3,10 +3,34 @@ import ipaddress
 import re
 from typing import Optional
 
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+_MAC_SEPARATORS = frozenset(":-")
+_MAC_STRIP = str.maketrans("", "", ":-.")
+
+# One alternation compiled at import: a single scan per validated command
+_DANGEROUS_RE = re.compile(
+    '|'.join(
+        f'(?:{pattern})'
+        for pattern in (
+            r'rm\s+-rf',
+            r'format\s+',
+            r'del\s+/[qf]',
+            r'rmdir',
+            r'powershell.*-enc',
+            r'cmd\.exe.*/c',
+        )
+    ),
+    re.IGNORECASE,
+)
+
 
 def validate_mac_address(mac: str) -> bool:
     """
     Validate MAC address format.
+
+    Accepts ``XX:XX:XX:XX:XX:XX`` (``:`` or ``-`` separators) and
+    ``XXXX.XXXX.XXXX``.  Checked by position instead of with a regex:
+    the two forms differ in length, so separators sit at fixed offsets.
     
     Args:
         mac: MAC address string
@@ -14,10 +38,21 @@ def validate_mac_address(mac: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    pattern = re.compile(
-        r'^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$|^([0-9A-Fa-f]{4}\.){2}[0-9A-Fa-f]{4}$'
-    )
-    return bool(pattern.match(mac))
+    if len(mac) == 17:
+        # Separators at 2, 5, ..., 14; hex digits at every other offset
+        return (
+            _MAC_SEPARATORS.issuperset(mac[2::3])
+            and _HEX_DIGITS.issuperset(mac[0::3])
+            and _HEX_DIGITS.issuperset(mac[1::3])
+        )
+    if len(mac) == 14:
+        return (
+            mac[4] == mac[9] == "."
+            and _HEX_DIGITS.issuperset(mac[:4])
+            and _HEX_DIGITS.issuperset(mac[5:9])
+            and _HEX_DIGITS.issuperset(mac[10:])
+        )
+    return False
 
 
 def validate_ip_address(ip: str) -> bool:
@@ -30,8 +65,15 @@ def validate_ip_address(ip: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
+    # LAN targets are almost always IPv4: parse that directly and only
+    # fall back to IPv6 on failure
+    try:
+        ipaddress.IPv4Address(ip)
+        return True
+    except ValueError:
+        pass
     try:
-        ipaddress.ip_address(ip)
+        ipaddress.IPv6Address(ip)
         return True
     except ValueError:
         return False
@@ -49,22 +91,12 @@ def validate_command(command: str, allowed_commands: Optional[list] = None) -> b
         True if safe, False otherwise
     """
     # Block dangerous commands
-    dangerous_patterns = [
-        r'rm\s+-rf',
-        r'format\s+',
-        r'del\s+/[qf]',
-        r'rmdir',
-        r'powershell.*-enc',
-        r'cmd\.exe.*/c',
-    ]
-    
-    for pattern in dangerous_patterns:
-        if re.search(pattern, command, re.IGNORECASE):
-            return False
+    if _DANGEROUS_RE.search(command):
+        return False
     
     # If whitelist is provided, check against it
     if allowed_commands:
-        return command.strip().lower() in [c.lower() for c in allowed_commands]
+        return command.strip().lower() in {c.lower() for c in allowed_commands}
     
     return True
 
@@ -74,13 +106,10 @@ def sanitize_mac_address(mac: str) -> str:
     Normalize MAC address to standard format (XX:XX:XX:XX:XX:XX).
     
     Args:
-        mac: MAC address string
+        mac: MAC address string (validate with validate_mac_address first)
         
     Returns:
         Normalized MAC address
     """
-    # Remove common separators
-    mac = mac.replace('-', '').replace('.', '').upper()
-    
-    # Add colons
-    return ':'.join(mac[i:i+2] for i in range(0, 12, 2))
+    # Drop all separators in one pass; the hex codec re-inserts colons
+    return bytes.fromhex(mac.translate(_MAC_STRIP)).hex(':').upper()